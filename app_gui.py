@@ -9,8 +9,11 @@ UX Principles Applied:
 """
 import os
 import sys
+import time
 import ctypes
 
+LAUNCH_TIME = time.perf_counter()  # Startup timing report starts here
+
 # Add NVIDIA CUDA DLLs to PATH before importing ctranslate2/faster_whisper
 def setup_cuda_paths():
     """Add CUDA library paths for Windows and load DLLs explicitly"""
@@ -45,37 +48,44 @@ def setup_cuda_paths():
 
 setup_cuda_paths()
 from utils.logger_config import setup_logging
+from utils.settings import load_settings, save_settings
+from utils.startup_timing import StartupTimer
 setup_logging()
 
 import json
 import threading
 import queue
-import time
 from datetime import datetime
 import customtkinter as ctk
-import pyaudiowpatch as pyaudio
-import numpy as np
-from faster_whisper import WhisperModel
-
-try:
-    import argostranslate.package
-    import argostranslate.translate
-    TRANSLATION_AVAILABLE = True
-except ImportError:
-    TRANSLATION_AVAILABLE = False
 
 # AI Learning Assistant
 from learning_assistant.session_manager import SessionManager
 from learning_assistant.prompts import SUBJECT_CONFIGS, DEFAULT_SUBJECT
+from learning_assistant.response_cache import ResponseCache
 from ui.study_panel import StudyPanel
-
-SAMPLE_RATE = 16000
-CHUNK_DURATION = 3.0
-BUFFER_DURATION = 0.5
+from ui.jobs_panel import JobsPanel
+from transcription.live import LiveTranscriber, SAMPLE_RATE
+from transcription.sources import create_source
+from transcription.model_registry import ModelRegistry, detect_device
+from transcription.refiner import LiveRefiner
+from transcription.engine_process import InferenceProcess
+from transcription.engines import create_engine
+from transcription.file_transcriber import choose_strategy, transcribe_file
+from transcription.jobs import JobQueue, audio_files_in, DONE
+from transcription.checkpoint import SegmentCheckpoint
+from transcription.transcript_cache import TranscriptCache, cache_key, file_digest
+from transcription.translation import (TRANSLATION_AVAILABLE, ArgosTranslator, TranslationWorker,
+                                       install_package, installed_package)
+
+MODEL_MAP = {"Rápido": "small", "Balanceado": "medium", "Preciso": "large-v3"}
+MODEL_LABELS = {size: label for label, size in MODEL_MAP.items()}
+DUAL_LABEL = "Dual"  # settings["dual_live_model"] live + background refinement with settings["refine_model"]
 
 
 class TranscriptionApp(ctk.CTk):
     def __init__(self):
+        self.startup = StartupTimer(LAUNCH_TIME)
+        self.startup.mark("imports")
         super().__init__()
         
         # Window config
@@ -89,25 +99,59 @@ class TranscriptionApp(ctk.CTk):
         # State
         self.is_running = False
         self.audio_thread = None
+        self.live_transcriber = None  # Current session's (an older one may still be draining after Stop)
+        self.live_refiner = None
+        self.live_session_no = 0   # Current session; also tags transcript lines so refined text can replace them
         self.text_queue = queue.Queue()
         self.whisper_model = None
+        self.model_registry = ModelRegistry()  # Shared by the live and file workers
+        self.inference_engine = None  # Live model in a child process (settings: live_out_of_process)
+        self._engine_lock = threading.Lock()
         self.translate_func = None
+        self.translation_worker = None  # Translates final lines off the UI thread (started with the translator)
+        self._translation_installing = False
         
         # Settings
-        self.selected_model = "medium"
+        self.settings = load_settings()
+        self.selected_model = self.settings["model"]
+        self.live_refine = self.settings.get("live_refine", False)
+        self.live_engine = self.settings.get("live_engine", "whisper")
+        self.transcript_cache = TranscriptCache(max_bytes=self.settings.get("transcript_cache_mb", 200) * 2**20)
+        self.live_mode = "chunked"
         self.use_microphone = False
-        self.translate_enabled = False
+        self.translate_enabled = self.settings.get("translate", False) and TRANSLATION_AVAILABLE
         self.settings_visible = False
+        self.metrics_visible = False
         self.selected_subject = DEFAULT_SUBJECT
         
-        self.session_manager = SessionManager()
+        llm_cache_mb = self.settings.get("llm_cache_mb", 50)
+        self.session_manager = SessionManager(parallelism=self.settings.get("analysis_parallel", 0),
+                                              analysis_mode=self.settings.get("analysis_mode", "steps"),
+                                              response_cache=ResponseCache(max_bytes=llm_cache_mb * 2**20) if llm_cache_mb else None,
+                                              bypass_cache=self.settings.get("llm_cache_bypass", False))
+        
+        # Uploaded files are transcribed by a persistent job queue (one shared model)
+        self.job_queue = JobQueue(self._run_file_job, on_update=lambda job: self.text_queue.put(("job", job)),
+                                  concurrency=self.settings.get("file_job_concurrency", 1))
+        
+        self.startup.mark("state")
         
         # UI Setup
         self._create_ui()
+        self.startup.mark("ui")
         self._check_queue()
+        for job in self.job_queue.snapshot():
+            self.text_queue.put(("job", job))
+        self.job_queue.start()
+        
+        self.after(0, self._on_first_frame)
         
         if TRANSLATION_AVAILABLE:
             threading.Thread(target=self._init_translation, daemon=True).start()
+        
+        # Load + warm up the last used model so the first caption doesn't wait for it
+        if self.settings.get("preload_model", True):
+            threading.Thread(target=self._preload_model, daemon=True).start()
     
     def _create_ui(self):
         """Create single-window UI with tabs (Transcribe / Study)"""
@@ -136,6 +180,7 @@ class TranscriptionApp(ctk.CTk):
         action_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 15))
         action_frame.grid_columnconfigure(0, weight=1)
         action_frame.grid_columnconfigure(1, weight=1)
+        action_frame.grid_columnconfigure(2, weight=0)
         
         # Main Button (Fitts: Large)
         self.main_btn = ctk.CTkButton(
@@ -163,6 +208,20 @@ class TranscriptionApp(ctk.CTk):
         )
         self.upload_btn.grid(row=0, column=1, sticky="ew", padx=10)
         
+        # Folder import (a week of recordings at once)
+        self.folder_btn = ctk.CTkButton(
+            action_frame,
+            text="📁",
+            command=self._upload_audio_folder,
+            font=ctk.CTkFont(size=18),
+            width=60,
+            height=60,
+            corner_radius=30,
+            fg_color="#3a3a4c",
+            hover_color="#4a4a5c"
+        )
+        self.folder_btn.grid(row=0, column=2, padx=10)
+        
         # Status Bar
         self.status_bar = ctk.CTkFrame(parent, fg_color="#1e1e2e", corner_radius=10, height=35)
         self.status_bar.grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 10))
@@ -180,6 +239,10 @@ class TranscriptionApp(ctk.CTk):
         )
         self.settings_btn.pack(side="right", padx=10)
         
+        # Real-time factor of live inference (filled while transcribing)
+        self.rtf_label = ctk.CTkLabel(self.status_bar, text="", font=ctk.CTkFont(size=11), text_color="#777")
+        self.rtf_label.pack(side="right", padx=5)
+        
         # ===== SETTINGS PANEL =====
         self.settings_frame = ctk.CTkFrame(parent, fg_color="#1a1a2a", corner_radius=10)
         # Hidden by default
@@ -195,10 +258,34 @@ class TranscriptionApp(ctk.CTk):
         
         # Model
         ctk.CTkLabel(settings_inner, text="Precisión:", font=ctk.CTkFont(size=12)).pack(side="left", padx=(15, 5))
-        self.model_switch = ctk.CTkSegmentedButton(settings_inner, values=["Rápido", "Balanceado", "Preciso"], command=self._on_model_change)
-        self.model_switch.set("Balanceado")
+        self.model_switch = ctk.CTkSegmentedButton(settings_inner, values=["Rápido", "Balanceado", "Preciso", DUAL_LABEL], command=self._on_model_change)
+        self.model_switch.set(DUAL_LABEL if self.live_refine else MODEL_LABELS.get(self.selected_model, "Balanceado"))
         self.model_switch.pack(side="left", padx=5)
         
+        # Live decoding mode
+        ctk.CTkLabel(settings_inner, text="Modo:", font=ctk.CTkFont(size=12)).pack(side="left", padx=(15, 5))
+        self.mode_switch = ctk.CTkSegmentedButton(settings_inner, values=["Bloques", "Streaming"], command=self._on_live_mode_change)
+        self.mode_switch.set("Bloques")
+        self.mode_switch.pack(side="left", padx=5)
+        
+        # Live speech engine (Vosk: partial results at a fraction of Whisper's CPU cost)
+        ctk.CTkLabel(settings_inner, text="Motor:", font=ctk.CTkFont(size=12)).pack(side="left", padx=(15, 5))
+        self.engine_switch = ctk.CTkSegmentedButton(settings_inner, values=["Whisper", "Vosk"], command=self._on_engine_change)
+        self.engine_switch.set("Vosk" if self.live_engine == "vosk" else "Whisper")
+        self.engine_switch.pack(side="left", padx=5)
+        
+        # Debug overlay with live latency / audio-health metrics
+        self.metrics_switch = ctk.CTkSwitch(settings_inner, text="📈 Métricas", font=ctk.CTkFont(size=12), command=self._toggle_metrics_overlay)
+        self.metrics_switch.pack(side="left", padx=(15, 5))
+        
+        # EN→ES translation of final lines (argostranslate, offline)
+        self.translate_switch = ctk.CTkSwitch(settings_inner, text="🌐 Traducir", font=ctk.CTkFont(size=12), command=self._on_translate_toggle)
+        if self.translate_enabled:
+            self.translate_switch.select()
+        if not TRANSLATION_AVAILABLE:
+            self.translate_switch.configure(state="disabled")
+        self.translate_switch.pack(side="left", padx=(15, 5))
+        
         # ===== CONTENT AREA =====
         content_frame = ctk.CTkFrame(parent, fg_color="transparent")
         content_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
@@ -210,6 +297,10 @@ class TranscriptionApp(ctk.CTk):
         self.original_text = ctk.CTkTextbox(content_frame, font=ctk.CTkFont(size=15), wrap="word", fg_color="#252535", corner_radius=10)
         self.original_text.grid(row=0, column=0, sticky="nsew", pady=5)
         
+        # Metrics overlay (hidden unless enabled in settings)
+        self.metrics_overlay = ctk.CTkLabel(content_frame, text="", font=ctk.CTkFont(family="Consolas", size=11),
+                                            text_color="#8fd", fg_color="#1a1a2a", corner_radius=6, justify="left")
+        
         # Live Preview Bar
         self.live_bar = ctk.CTkFrame(content_frame, fg_color="#2b2b3b", height=40, corner_radius=8)
         self.live_bar.grid(row=1, column=0, sticky="ew", pady=5)
@@ -224,6 +315,12 @@ class TranscriptionApp(ctk.CTk):
         self.translated_text = ctk.CTkTextbox(content_frame, font=ctk.CTkFont(size=15), wrap="word", fg_color="#252535", corner_radius=10)
         # Hidden until enabled
         
+        # File job queue (hidden until the first job is enqueued)
+        self.jobs_panel = JobsPanel(content_frame, self.job_queue)
+        self.jobs_panel_visible = False
+        if self.translate_enabled:
+            self._show_translation_box(True)
+        
         # ===== SUBJECT & ANALYZE BAR =====
         bottom_frame = ctk.CTkFrame(parent, fg_color="#1e1e2e", corner_radius=15, height=140)
         bottom_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=(5, 15))
@@ -286,11 +383,33 @@ class TranscriptionApp(ctk.CTk):
             self.settings_frame.grid(row=3, column=0, sticky="ew", pady=(0, 10)) # Adjust row
             self.settings_visible = True
 
+    def _toggle_metrics_overlay(self):
+        self.metrics_visible = bool(self.metrics_switch.get())
+        if self.metrics_visible:
+            self.metrics_overlay.place(relx=1.0, rely=0.0, anchor="ne", x=-20, y=10)
+            self._refresh_metrics_overlay()
+        else:
+            self.metrics_overlay.place_forget()
+
+    def _refresh_metrics_overlay(self):
+        if not self.metrics_visible:
+            return
+        if self.live_transcriber:
+            self.metrics_overlay.configure(text=self.live_transcriber.metrics.summary_text())
+        else:
+            self.metrics_overlay.configure(text="Sin sesión en vivo")
+        self.after(1000, self._refresh_metrics_overlay)
+
     def _select_subject(self, subject_key):
         self.selected_subject = subject_key
         for key, btn in self.subject_buttons.items():
             btn.configure(fg_color="#5a189a" if key == subject_key else "#3a3a4c")
         
+        if self.live_transcriber:
+            self.live_transcriber.language = "en" if subject_key == "english" else "es"
+        if self.live_refiner:
+            self.live_refiner.language = "en" if subject_key == "english" else "es"
+        
         config = SUBJECT_CONFIGS[subject_key]
         self.status_text.configure(text=f"Modo seleccionado: {config['name']}")
 
@@ -363,14 +482,56 @@ class TranscriptionApp(ctk.CTk):
         self.use_microphone = "Mic" in value
         self.status_text.configure(text=f"Fuente: {'Micrófono' if self.use_microphone else 'Altavoz'}")
 
+    def _save_settings(self):
+        try:
+            save_settings(self.settings)
+        except OSError as e:
+            print(f"Error saving settings: {e}")
+
     def _on_model_change(self, value):
-        model_map = {"Rápido": "small", "Balanceado": "medium", "Preciso": "large-v3"}
-        self.selected_model = model_map.get(value, "medium")
-        self.whisper_model = None
+        self.live_refine = value == DUAL_LABEL
+        if not self.live_refine:
+            # Dual only changes the live model; uploads keep the last precision choice
+            self.selected_model = MODEL_MAP.get(value, "medium")
+        self.whisper_model = None  # Re-resolved on next start; weights stay cached in the registry
+        self.settings["model"] = self.selected_model
+        self.settings["live_refine"] = self.live_refine
+        self._save_settings()
+
+    def _on_engine_change(self, value):
+        self.live_engine = value.lower()
+        self.settings["live_engine"] = self.live_engine
+        self._save_settings()
+        self.status_text.configure(text=f"Motor en vivo: {value} (se aplica al iniciar)")
+
+    def _on_live_mode_change(self, value):
+        self.live_mode = "streaming" if value == "Streaming" else "chunked"
+        self.status_text.configure(text=f"Modo en vivo: {value} (se aplica al iniciar)")
 
     def _on_translate_toggle(self):
-        # Implementation for translation toggle (optional in this simplified view)
-        pass
+        self.translate_enabled = bool(self.translate_switch.get())
+        self._show_translation_box(self.translate_enabled)
+        self.settings["translate"] = self.translate_enabled
+        self._save_settings()
+        if self.translate_enabled and self.translate_func is None:
+            threading.Thread(target=self._init_translation, daemon=True).start()
+
+    def _show_translation_box(self, visible):
+        if visible:
+            self.trans_label.grid(row=2, column=0, sticky="nw", padx=10)
+            self.translated_text.grid(row=2, column=0, sticky="nsew", pady=(25, 5))
+        else:
+            self.trans_label.grid_forget()
+            self.translated_text.grid_forget()
+
+    def _submit_translation(self, tag, text):
+        """UI thread: hand a final line to the translation worker (never waits for the translator)."""
+        if self.translate_enabled and self.translation_worker and self.translate_func:
+            self.translation_worker.submit(tag, text)
+
+    def _on_translated(self, tag, text):
+        """Translation worker thread: lines arrive in the order they were submitted."""
+        self.text_queue.put(("translated", text))
 
     def _toggle_transcription(self):
         if self.is_running:
@@ -380,119 +541,220 @@ class TranscriptionApp(ctk.CTk):
 
     def _start(self):
         self.is_running = True
+        self.live_session_no += 1
         self.main_btn.configure(text="⏹  Detener", fg_color="#e63946", hover_color="#c53030")
         self.status_dot.configure(text_color="#ffaa00")
         self.status_text.configure(text="Preparando transcriptor...")
-        self.audio_thread = threading.Thread(target=self._transcription_worker, daemon=True)
+        self.audio_thread = threading.Thread(target=self._transcription_worker, args=(self.live_session_no,),
+                                             daemon=True)
         self.audio_thread.start()
 
     def _stop(self):
         self.is_running = False
+        if self.live_transcriber:
+            self.live_transcriber.stop()
         self.main_btn.configure(text="🎙️  Iniciar Transcripción", fg_color="#00a67d", hover_color="#008f6b")
         self.status_dot.configure(text_color="#666")
         self.status_text.configure(text="Listo")
         self.live_text.configure(text="")
 
+    def _on_first_frame(self):
+        self.startup.mark("first frame")
+        self.startup.log_report()
+
     def _init_translation(self):
+        """Startup stage (background): offline check of the installed EN→ES package. No network, no model load."""
+        started = time.perf_counter()
+        try:
+            installed = installed_package("en", "es") is not None
+        except Exception as e:
+            installed = False
+            self.text_queue.put(("status", f"⚠️ Traducción no disponible: {e}"))
+        self.startup.add_background("translation check", time.perf_counter() - started)
+        if installed:
+            self._start_translator()
+        elif self.translate_enabled:
+            self._install_translation()
+
+    def _start_translator(self):
+        if self.translation_worker:
+            return
+        # The translation model itself loads on the first sentence, on the worker thread
+        self.translate_func = ArgosTranslator("en", "es")
+        self.translation_worker = TranslationWorker(
+            self.translate_func, self._on_translated,
+            cache_size=self.settings.get("translation_cache_size", 2000))
+        self.translation_worker.start()
+
+    def _install_translation(self):
+        """On demand (translation enabled but not installed): refresh the package index and download EN→ES."""
+        if self._translation_installing:
+            return
+        self._translation_installing = True
+        self.text_queue.put(("status", "⏳ Descargando paquete de traducción EN→ES..."))
+        try:
+            if install_package("en", "es"):
+                self._start_translator()
+                self.text_queue.put(("status", "✅ Traducción EN→ES lista"))
+            else:
+                self.text_queue.put(("status", "⚠️ Paquete EN→ES no disponible en el índice"))
+        except Exception as e:
+            self.text_queue.put(("status", f"⚠️ No se pudo descargar la traducción (¿sin conexión?): {e}"))
+        finally:
+            self._translation_installing = False
+
+    def _live_model_size(self):
+        return self.settings.get("dual_live_model", "small") if self.live_refine else self.selected_model
+
+    def _preload_model(self):
+        """Startup stage: load the last used live model and run a dummy decode in the background."""
+        size = self._live_model_size()
         try:
-            argostranslate.package.update_package_index()
-            packages = argostranslate.package.get_available_packages()
-            pkg = next((p for p in packages if p.from_code == "en" and p.to_code == "es"), None)
-            if pkg:
-                installed = argostranslate.package.get_installed_packages()
-                if not any(p.from_code == "en" and p.to_code == "es" for p in installed):
-                    argostranslate.package.install_from_path(pkg.download())
-                self.translate_func = lambda t: argostranslate.translate.translate(t, "en", "es")
-        except: pass
-
-    def _load_model(self):
+            started = time.perf_counter()
+            self.text_queue.put(("status", f"⏳ Precargando modelo {size}..."))
+            if self.settings.get("live_out_of_process", False):
+                model = self._get_engine()
+            else:
+                model = self.model_registry.get(size)
+            self.model_registry.warm_up(model)
+            elapsed = time.perf_counter() - started
+            self.startup.add_background("model preload", elapsed)
+            self.text_queue.put(("status", f"✅ Modelo {size} listo ({elapsed:.1f}s)"))
+        except Exception as e:
+            self.text_queue.put(("status", f"⚠️ No se pudo precargar el modelo: {e}"))
+
+    def _get_engine(self):
+        """Inference child process for the live model, (re)started if needed."""
+        size = self._live_model_size()
+        with self._engine_lock:
+            if self.inference_engine and self.inference_engine.size != size:
+                self.inference_engine.close()
+                self.inference_engine = None
+            if self.inference_engine is None:
+                self.text_queue.put(("status", "Iniciando proceso de inferencia..."))
+                engine = InferenceProcess(size, *detect_device())
+                engine.start()
+                self.inference_engine = engine
+            return self.inference_engine
+
+    def _load_model(self, live=False):
+        """Point self.whisper_model at the live or upload model, loading it only if not cached."""
+        size = self._live_model_size() if live else self.selected_model
         try:
-            self.text_queue.put(("status", f"Cargando modelo..."))
-            try:
-                import ctranslate2
-                device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
-                compute = "float16" if device == "cuda" else "int8"
-            except:
-                device, compute = "cpu", "int8"
-            self.whisper_model = WhisperModel(self.selected_model, device=device, compute_type=compute)
+            if live and self.settings.get("live_out_of_process", False):
+                # Keeps faster-whisper's Python work off the UI process's GIL
+                self.whisper_model = self._get_engine()
+                return True
+            if not self.model_registry.is_loaded(size):
+                self.text_queue.put(("status", "Cargando modelo..."))
+            self.whisper_model = self.model_registry.get(size)
             return True
         except Exception as e:
             self.text_queue.put(("error", str(e)))
             return False
 
-    def _transcription_worker(self):
+    def _transcription_worker(self, session_no):
+        """
+        One live session. Its transcriber, refiner and draft are locals: after
+        Stop this thread may still be draining its backlog while the next
+        session already runs, and must not touch that session's state.
+        """
+        def is_current():
+            return self.is_running and self.live_session_no == session_no
+
+        session = {"class_id": None}
         try:
-            if self.whisper_model is None and not self._load_model():
-                self.after(0, self._stop)
+            # Language logic (User feedback: Force Spanish for non-English subjects)
+            lang = "en" if self.selected_subject == "english" else "es"
+            engine = None
+            if self.live_engine == "vosk":
+                self.text_queue.put(("status", "Cargando modelo Vosk..."))
+                engine = create_engine("vosk", vosk_model_path=self.settings.get("vosk_model", "model"))
+            elif not self._load_model(live=True):
+                if is_current():
+                    self.after(0, self._stop)
                 return
-            p = pyaudio.PyAudio()
-            wasapi = p.get_host_api_info_by_type(pyaudio.paWASAPI)
-            if self.use_microphone:
-                device = p.get_device_info_by_index(wasapi["defaultInputDevice"])
-            else:
-                speakers = p.get_device_info_by_index(wasapi["defaultOutputDevice"])
-                device = speakers
-                if not speakers.get("isLoopbackDevice"):
-                    for lb in p.get_loopback_device_info_generator():
-                        if speakers["name"] in lb["name"]:
-                            device = lb
-                            break
-            rate = int(device["defaultSampleRate"])
-            channels = device["maxInputChannels"]
-            buffer_frames = int(rate * BUFFER_DURATION)
-            chunk_frames = int(SAMPLE_RATE * CHUNK_DURATION)
-            stream = p.open(format=pyaudio.paInt16, channels=channels, rate=rate,
-                            frames_per_buffer=buffer_frames, input=True,
-                            input_device_index=device["index"])
-            self.text_queue.put(("ready", "Escuchando..."))
-            audio_buffer = np.array([], dtype=np.float32)
-            last_text = ""
-            while self.is_running:
-                data = stream.read(buffer_frames, exception_on_overflow=False)
-                audio = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-                if channels == 2: audio = audio.reshape(-1, 2).mean(axis=1)
-                if rate != SAMPLE_RATE:
-                    new_len = int(len(audio) * SAMPLE_RATE / rate)
-                    audio = np.interp(np.linspace(0, len(audio)-1, new_len), np.arange(len(audio)), audio).astype(np.float32)
-                audio_buffer = np.concatenate([audio_buffer, audio])
-                if len(audio_buffer) >= chunk_frames:
-                    # Language logic (User feedback: Force Spanish for non-English subjects)
-                    lang = "en" if self.selected_subject == "english" else "es"
-                    segments, _ = self.whisper_model.transcribe(
-                        audio_buffer[:chunk_frames], language=lang, beam_size=5,
-                        vad_filter=True, vad_parameters=dict(min_silence_duration_ms=500))
-                    text = " ".join(s.text.strip() for s in segments).strip()
-                    if text and text != last_text:
-                        self.text_queue.put(("final", text))
-                        last_text = text
-                    audio_buffer = audio_buffer[chunk_frames - int(SAMPLE_RATE * 0.5):]
-                secs = len(audio_buffer) / SAMPLE_RATE
-                self.text_queue.put(("partial", f"Procesando... {secs:.1f}s"))
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
+            source = create_source(os.environ.get("AUDIO_SOURCE", "wasapi"), self.use_microphone)
+            refiner = None
+            if self.live_refine:
+                refine_size = self.settings.get("refine_model", "large-v3")
+                refiner = LiveRefiner(lambda: self.model_registry.get(refine_size), self._on_refined,
+                                      language=lang, is_busy=lambda: transcriber.is_backlogged())
+                refiner.start()
+            transcriber = LiveTranscriber(self.whisper_model, source, self.text_queue, language=lang,
+                                          mode=self.live_mode,
+                                          on_segment=lambda segment, tag: self._on_live_segment(session, refiner, segment, tag),
+                                          on_audio=refiner.feed if refiner else None, engine=engine,
+                                          line_tag=f"live{session_no}")
+            if is_current():
+                self.live_transcriber, self.live_refiner = transcriber, refiner
+                transcriber.run()
+            if refiner:
+                refiner.close()  # Keeps refining the backlog now that the CPU is free
+            if session["class_id"]:
+                duration = transcriber.audio_samples // SAMPLE_RATE
+                self.session_manager.db.update_class_duration(session["class_id"], duration)
+            if is_current():  # Source ran dry (file/synthetic replay)
+                self.after(0, self._stop)
         except Exception as e:
             self.text_queue.put(("error", str(e)))
 
+    def _on_live_segment(self, session, refiner, segment, tag):
+        """Inference thread: append each final line to its session's draft as soon as it's produced."""
+        if session["class_id"] is None:
+            class_id = session["class_id"] = self.session_manager.start_segment_session(subject=self.selected_subject)
+            self.after(0, lambda: setattr(self.study_panel, "current_class_id", class_id))
+        segment_id, = self.session_manager.append_segments(session["class_id"], [segment])
+        if refiner:
+            # Keyed by row id: live start times are not unique enough to find the line again
+            # The tag is the one LiveTranscriber posted with the "final" line, so the UI finds the same line
+            refiner.submit((tag, segment_id), segment)
+
+    def _on_refined(self, key, segment, text):
+        """Refiner thread: a line was re-transcribed by the larger model."""
+        _, segment_id = key
+        self.session_manager.db.update_segment_text(segment_id, text)
+        self.text_queue.put(("refined", (key, text)))
+
+    def _replace_refined_line(self, key, text):
+        tag, _ = key
+        found = self.original_text.tag_nextrange(tag, "1.0")
+        if not found:
+            return
+        start, end = found
+        self.original_text.delete(start, end)
+        self.original_text.insert(start, text, tag)
+
     def _check_queue(self):
         try:
             while True:
                 msg_type, text = self.text_queue.get_nowait()
                 if msg_type == "partial": self.live_text.configure(text=text[:80])
                 elif msg_type == "status": self.status_text.configure(text=text)
+                elif msg_type == "rtf": self.rtf_label.configure(text=text)
                 elif msg_type == "ready": 
                     self.status_dot.configure(text_color="#00ff00")
                     self.status_text.configure(text=text)
                 elif msg_type == "final":
                     ts = datetime.now().strftime("%H:%M:%S")
-                    self.original_text.insert("end", f"[{ts}] {text}\n")
+                    tag, text = text
+                    self.original_text.insert("end", f"[{ts}] ")
+                    self.original_text.insert("end", text, tag)
+                    self.original_text.insert("end", "\n")
                     self.original_text.see("end")
                     self.live_text.configure(text="")
+                    self._submit_translation(tag, text)
+                    if self.live_transcriber:
+                        self.live_transcriber.metrics.final_displayed()
+                elif msg_type == "refined": self._replace_refined_line(*text)
+                elif msg_type == "translated":
+                    self.translated_text.insert("end", text + "\n")
+                    self.translated_text.see("end")
                 elif msg_type == "fragment":
                     self.original_text.insert("end", text + " ")
                     self.original_text.see("end")
-                elif msg_type == "clear":
-                    self.original_text.delete("1.0", "end")
+                elif msg_type == "clear": self._clear_text()
+                elif msg_type == "job": self._on_job_update(text)
                 elif msg_type == "error": self.original_text.insert("end", f"⚠️ {text}\n")
         except queue.Empty: pass
         self.after(100, self._check_queue)
@@ -500,76 +762,113 @@ class TranscriptionApp(ctk.CTk):
     def _upload_audio_file(self):
         from tkinter import filedialog
         filetypes = [("Audio", "*.mp3 *.wav *.flac *.ogg *.m4a *.wma *.aac *.opus"), ("All", "*.*")]
-        filepath = filedialog.askopenfilename(title="Seleccionar archivo de audio", filetypes=filetypes)
-        if not filepath: return
-        self.status_dot.configure(text_color="#ffaa00")
-        self.status_text.configure(text=f"📂 Cargando: {filepath.split('/')[-1]}...")
-        self.upload_btn.configure(state="disabled", text="⏳ Procesando...")
-        self.main_btn.configure(state="disabled")
-        threading.Thread(target=self._transcribe_audio_file, args=(filepath,), daemon=True).start()
+        filepaths = filedialog.askopenfilenames(title="Seleccionar archivos de audio", filetypes=filetypes)
+        if filepaths:
+            self._enqueue_files(list(filepaths))
 
-    def _transcribe_audio_file(self, filepath):
-        try:
-            if self.whisper_model is None:
-                self.text_queue.put(("status", "Cargando modelo..."))
-                try:
-                    import ctranslate2
-                    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
-                    compute = "float16" if device == "cuda" else "int8"
-                except: device, compute = "cpu", "int8"
-                self.whisper_model = WhisperModel(self.selected_model, device=device, compute_type=compute)
-            self.text_queue.put(("status", "Transcribiendo..."))
-            
-            # Language logic (User feedback: Force Spanish for non-English subjects)
-            lang = "en" if self.selected_subject == "english" else "es"
-            
-            # Streaming (Generator Pattern)
-            segments, info = self.whisper_model.transcribe(filepath, language=lang, beam_size=5, vad_filter=True)
-            
-            full_text = []
-            self.text_queue.put(("clear", "")) # Prepare UI
-            
-            for segment in segments:
-                text = segment.text.strip()
-                if text:
-                    self.text_queue.put(("fragment", text)) # Stream to UI
-                    full_text.append(text)
-            
-            final_text = " ".join(full_text)
-            
-            if final_text: 
-                # Auto-save draft
-                self.after(0, lambda: self._on_file_transcribed(final_text, filepath, info.duration))
-            else: 
-                self.text_queue.put(("status", "⚠️ No se detectó audio"))
-                self.after(0, self._reset_btns)
-        except Exception as e:
-            self.text_queue.put(("error", str(e)))
-            self.after(0, self._reset_btns)
+    def _upload_audio_folder(self):
+        from tkinter import filedialog
+        folder = filedialog.askdirectory(title="Seleccionar carpeta de grabaciones")
+        if not folder: return
+        filepaths = audio_files_in(folder)
+        if not filepaths:
+            self.status_text.configure(text="⚠️ No hay archivos de audio en la carpeta")
+            return
+        self._enqueue_files(filepaths)
 
-    def _on_file_transcribed(self, text, filepath, duration=0):
-        import os
-        filename = os.path.basename(filepath)
-        
-        # Save Draft Session immediately
+    def _enqueue_files(self, filepaths):
+        self.job_queue.add(filepaths, self.selected_subject)
+        self.status_dot.configure(text_color="#ffaa00")
+        self.status_text.configure(text=f"📂 {len(filepaths)} archivo(s) en cola")
+
+    def _on_job_update(self, job):
+        if not self.jobs_panel_visible:
+            self.jobs_panel.grid(row=3, column=0, sticky="ew", pady=5)
+            self.jobs_panel_visible = True
+        self.jobs_panel.update_job(job)
+        if not self.is_running:
+            if self.job_queue.is_busy():
+                self.main_btn.configure(state="disabled")  # Live capture would compete with the queue for CPU/GPU
+            else:
+                self._reset_btns()
+        if job.status == DONE and job.class_id:
+            self.study_panel.current_class_id = job.class_id  # Track latest session
+            self.status_dot.configure(text_color="#00ff00")
+            self.status_text.configure(text=f"Transcripción guardada en historial: {job.name}")
+
+    def _run_file_job(self, job, report):
+        """JobQueue runner (worker thread): transcribe one file into a draft session, segment by segment."""
+        workers = self.settings.get("file_workers", 1)
+        stream_decode = self.settings.get("file_stream_decode", True)
+        # Decided once: the batch size depends on free memory, and the cache key must match what actually runs
+        strategy, batch_size = choose_strategy(workers, self.settings.get("file_batch_size", 1))
+        parallel = strategy == "parallel"
+        # Language logic (User feedback: Force Spanish for non-English subjects)
+        lang = "en" if job.subject == "english" else "es"
+        # With a single worker the running job streams into the transcript box, as before
+        stream = self.job_queue.concurrency == 1
+        
+        # Same audio + same decode settings -> reuse the stored transcript
+        self.text_queue.put(("status", f"Calculando huella de {job.name}..."))
+        key = cache_key(file_digest(job.path), self.selected_model, detect_device()[1], lang, beam_size=5,
+                        strategy=strategy, batch_size=batch_size, workers=workers if parallel else 1,
+                        stream_decode=stream_decode and not parallel)
+        cached = self.transcript_cache.get(key)
+        if cached and not job.class_id:
+            duration, segments = cached
+            if stream:
+                self.text_queue.put(("clear", ""))
+                self.text_queue.put(("fragment", " ".join(s.text for s in segments if s.text)))
+            self.text_queue.put(("status", f"⚡ {job.name}: transcripción en caché"))
+            class_id = self._start_file_draft(job)
+            self.session_manager.append_segments(class_id, segments)
+            self.session_manager.db.update_class_duration(class_id, int(duration))
+            return class_id
+        
+        if not parallel and not self._load_model():
+            raise RuntimeError("No se pudo cargar el modelo")
+        
+        # The draft is created up front and segments are committed as they arrive,
+        # so an interrupted job resumes where it stopped
+        if not job.class_id:
+            self.job_queue.set_class_id(job, self._start_file_draft(job))
+        checkpoint = SegmentCheckpoint(self.session_manager.db, job.class_id, job.path)
+        if stream:
+            self.text_queue.put(("clear", "")) # Prepare UI
+            if checkpoint.segments:
+                self.text_queue.put(("fragment", " ".join(s.text for s in checkpoint.segments if s.text)))
+        if checkpoint.resume_offset:
+            self.text_queue.put(("status", f"Reanudando {job.name} desde {checkpoint.resume_offset / 60:.0f} min..."))
+        
+        # Streaming (Generator Pattern)
+        duration, segments = transcribe_file(self.model_registry, job.path, self.selected_model, lang, workers=workers,
+                                             start_offset=checkpoint.resume_offset, stream_decode=stream_decode,
+                                             report=report, strategy=(strategy, batch_size))
         try:
-            class_id = self.session_manager.create_draft_session(
-                text, 
-                title=f"🎙️ {filename} ({datetime.now().strftime('%H:%M')})",
-                duration=int(duration),
-                subject=self.selected_subject,
-                source=filepath
-            )
-            self.study_panel.current_class_id = class_id # Track current session
-        except Exception as e:
-            print(f"Error saving draft: {e}")
-
-        # UI Updates
-        # self.original_text.delete("1.0", "end") # Already streamed
-        # self.original_text.insert("1.0", f"[📂 {filename}]\n\n{text}\n") # Optional: Header
-        self.status_dot.configure(text_color="#00ff00")
-        self.status_text.configure(text="Transcripción guardada en historial")
-        self._reset_btns()
+            for segment in segments:
+                checkpoint.add(segment)
+                report(segment.end / duration if duration else 0.0)
+                if stream and segment.text:
+                    self.text_queue.put(("fragment", segment.text)) # Stream to UI
+        finally:
+            segments.close()  # On cancel/error: stops the parallel workers now, not when garbage-collected
+            checkpoint.flush()  # Also on cancel/error, so a retry resumes
+        
+        if not any(s.text for s in checkpoint.segments):
+            self.session_manager.db.delete_class(job.class_id)
+            self.job_queue.set_class_id(job, None)
+            raise RuntimeError("No se detectó audio")
+        
+        self.transcript_cache.put(key, duration, checkpoint.segments)
+        self.session_manager.db.update_class_duration(job.class_id, int(duration))
+        return job.class_id
+
+    def _start_file_draft(self, job):
+        return self.session_manager.start_segment_session(
+            title=f"🎙️ {job.name} ({datetime.now().strftime('%H:%M')})",
+            subject=job.subject,
+            source=job.path
+        )
 
     def _reset_btns(self):
         self.upload_btn.configure(state="normal", text="📂 Cargar Audio")
@@ -578,6 +877,7 @@ class TranscriptionApp(ctk.CTk):
     
     def _clear_text(self):
         self.original_text.delete("1.0", "end")
+        self.translated_text.delete("1.0", "end")
 
     def _export_text(self):
         pass # Simplified for brevity
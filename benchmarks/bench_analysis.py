@@ -0,0 +1,75 @@
+"""
+Benchmark: step-by-step vs combined single-call AI analysis of one transcript.
+
+The step pipeline sends the transcript once per artifact (summary,
+vocabulary, quiz, flashcards); the combined mode sends it once. Reports LLM
+calls, prompt and output tokens (as counted by Ollama) and wall time for
+each, plus the number of items produced so quality regressions stand out.
+Needs a running Ollama server with the model pulled.
+
+Usage: python benchmarks/bench_analysis.py test_transcript.txt --subject hci [--model llama3.1:8b] [--runs 2]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from learning_assistant.agent import LearningAgent, MODEL_NAME
+from learning_assistant.prompts import SUBJECT_CONFIGS
+
+
+def run_steps(agent, text, subject):
+    summary = agent.generate_summary(text, subject)
+    return None, {
+        "summary": summary if summary and summary.get("summary") else None,
+        "vocabulary": agent.extract_vocabulary(text, subject),
+        "questions": agent.generate_questions(text, subject, count=5),
+        "flashcards": agent.create_flashcards(text, subject),
+    }
+
+
+def run_combined(agent, text, subject):
+    first_section = []
+    started = time.perf_counter()
+    sections = agent.generate_all(text, subject, count=5,
+                                  section_callback=lambda name, _: first_section.append(time.perf_counter() - started))
+    return (first_section[0] if first_section else None), sections
+
+
+def report(label, agent, started, first_section, result):
+    wall = time.perf_counter() - started
+    usage = agent.usage_log
+    counts = "  ".join(f"{name} {len(value) if isinstance(value, list) else int(bool(value))}"
+                       for name, value in result.items())
+    print(f"  {label:<10} {len(usage)} calls   prompt {sum(u['prompt_tokens'] for u in usage):6d} tok   "
+          f"output {sum(u['output_tokens'] for u in usage):5d} tok   {wall:6.1f} s wall   {counts}")
+    if first_section is not None:
+        print(f"  {'':<10} first section saved after {first_section:.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file", help="Plain-text transcript")
+    parser.add_argument("--subject", default="hci", choices=list(SUBJECT_CONFIGS))
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    text = open(args.file, encoding="utf-8").read()
+    agent = LearningAgent(args.model)
+    if not agent.ensure_connection():
+        sys.exit("Ollama is not reachable")
+    agent.generate_summary(text[:200], args.subject)  # Model load is not part of the comparison
+
+    print(f"{os.path.basename(args.file)}  {len(text)} chars  model {args.model}  subject {args.subject}")
+    for _ in range(args.runs):
+        for label, runner in (("steps", run_steps), ("combined", run_combined)):
+            agent.usage_log = []
+            started = time.perf_counter()
+            first_section, result = runner(agent, text, args.subject)
+            report(label, agent, started, first_section, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: live speech engines (Whisper vs Vosk) on the same fixture audio.
+
+Each engine receives the identical 16 kHz stream in 0.25 s blocks, as in the
+app's engine mode, as fast as it can consume it. Reports CPU and wall time
+per second of audio, how far into the audio the first partial appeared,
+the number of final lines, and the word error rate when a reference
+transcript is given.
+
+Usage:
+    python benchmarks/bench_engines.py clase.wav --engines whisper:small vosk:model --reference clase.txt
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transcription.engines import create_engine
+from transcription.live import ENGINE_STEP_DURATION, SAMPLE_RATE
+from transcription.resampler import StreamResampler
+from transcription.sources import create_source
+
+
+def load_fixture(path):
+    """Whole fixture as 16 kHz mono float32 (decoded once, outside the timed loop)."""
+    import numpy as np
+    source = create_source(f"file-fast:{path}")
+    source.open(0.5)
+    resampler = StreamResampler(source.sample_rate, SAMPLE_RATE, source.channels)
+    blocks = []
+    while data := source.read(int(source.sample_rate * 0.5)):
+        blocks.append(resampler.process_pcm16(data).copy())
+    source.close()
+    return np.concatenate(blocks)
+
+
+def word_error_rate(reference, hypothesis):
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / max(1, len(ref))
+
+
+def build_engine(spec, language):
+    kind, _, arg = spec.partition(":")
+    if kind == "whisper":
+        from faster_whisper import WhisperModel
+        model = WhisperModel(arg or "small", device="cpu", compute_type="int8")
+        return create_engine("whisper", model, language)
+    return create_engine(kind, vosk_model_path=arg or "model")
+
+
+def run(spec, engine, audio, reference):
+    step = int(SAMPLE_RATE * ENGINE_STEP_DURATION)
+    finals, first_partial = [], None
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for pos in range(0, len(audio), step):
+        for kind, text, _, _ in engine.accept(audio[pos:pos + step]):
+            if kind == "final":
+                finals.append(text)
+            elif first_partial is None:
+                first_partial = (pos + step) / SAMPLE_RATE
+    finals += [text for _, text, _, _ in engine.flush()]
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+
+    audio_secs = len(audio) / SAMPLE_RATE
+    line = (f"  {spec:<16} wall {wall / audio_secs * 1000:7.1f} ms/s   cpu {cpu / audio_secs * 1000:7.1f} ms/s   "
+            f"first partial {first_partial if first_partial is not None else float('nan'):5.2f} s   "
+            f"finals {len(finals)}")
+    if reference:
+        line += f"   WER {word_error_rate(reference, ' '.join(finals)):.1%}"
+    print(line)
+    return finals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file", help="Fixture audio (.wav, or anything soundfile reads)")
+    parser.add_argument("--engines", nargs="+", default=["whisper:small", "vosk:model"],
+                        help="whisper:<size> and/or vosk:<model dir>")
+    parser.add_argument("--language", default="es")
+    parser.add_argument("--reference", help="Plain-text reference transcript for WER")
+    parser.add_argument("--show", action="store_true", help="Print each engine's transcript")
+    args = parser.parse_args()
+
+    audio = load_fixture(args.file)
+    reference = open(args.reference, encoding="utf-8").read() if args.reference else None
+    print(f"{os.path.basename(args.file)}  {len(audio) / SAMPLE_RATE:.1f} s audio")
+    for spec in args.engines:
+        engine = build_engine(spec, args.language)  # Model load is not part of the comparison
+        finals = run(spec, engine, audio, reference)
+        if args.show:
+            print("    " + " ".join(finals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: sequential vs batched vs streamed-decode (vs parallel) transcription of one file.
+
+Reports seconds of audio transcribed per wall-clock second on CPU int8 for
+each mode, plus the segment count so obvious quality regressions stand out.
+
+Usage: python benchmarks/bench_file_modes.py clase.mp3 --model small --batch-size 8 [--workers 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from transcription.model_registry import ModelRegistry
+from transcription.file_transcriber import transcribe_file
+import transcription.file_transcriber as file_transcriber
+
+
+def run(label, registry, args, **kwargs):
+    start = time.perf_counter()
+    duration, segments = transcribe_file(registry, args.file, args.model, args.language, **kwargs)
+    count = sum(1 for _ in segments)
+    wall = time.perf_counter() - start
+    print(f"  {label:<22} {wall:7.1f} s wall   {duration / wall:6.2f} s audio / s   {count} segments")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file")
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--language", default="es")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=0, help="Also run the process-pool mode")
+    args = parser.parse_args()
+
+    # Force CPU int8 regardless of what the machine has
+    file_transcriber.detect_device = lambda: ("cpu", "int8")
+    registry = ModelRegistry()
+    registry.get(args.model, "cpu", "int8")  # Load time is not part of the comparison
+
+    print(f"{os.path.basename(args.file)}  model {args.model}  CPU int8")
+    run("sequential", registry, args)
+    run(f"batched (batch={args.batch_size})", registry, args, batch_size=args.batch_size)
+    run("sequential, streamed", registry, args, stream_decode=True)
+    if args.workers > 1:
+        run(f"parallel ({args.workers} procs)", registry, args, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
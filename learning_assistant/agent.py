@@ -1,18 +1,34 @@
 import ollama
 import json
 import logging
+import os
+import time
+from .json_stream import JsonSectionStream
 from .prompts import (
-    SUBJECT_CONFIGS, DEFAULT_SUBJECT,
+    SUBJECT_CONFIGS, DEFAULT_SUBJECT, COMBINED_SECTIONS,
     get_system_role, get_summary_prompt, get_vocabulary_prompt,
     get_question_prompt, get_flashcard_prompt, get_grammar_prompt,
-    get_roleplay_prompt
+    get_roleplay_prompt, get_combined_prompt, PROMPT_VERSION
 )
+from .response_cache import response_key
 
 MODEL_NAME = "llama3.1:8b"
+COMBINED_MAX_CHARS = 20000  # Above this the step methods chunk the transcript; one combined call can't
+
+def ollama_parallelism(default=1):
+    """Requests the Ollama server decodes at once (OLLAMA_NUM_PARALLEL), as seen from this process."""
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", default)))
+    except ValueError:
+        return default
 
 class LearningAgent:
-    def __init__(self, model_name=MODEL_NAME):
+    def __init__(self, model_name=MODEL_NAME, num_parallel=1, cache=None, bypass_cache=False):
         self.model = model_name
+        self.num_parallel = num_parallel  # Passed to `ollama serve` when the agent has to start it
+        self.cache = cache  # ResponseCache for _generate_json (None: always ask the model)
+        self.bypass_cache = bypass_cache  # Skip lookups but store fresh responses (forces regeneration)
+        self.usage_log = []  # One entry per LLM call: prompt/output tokens and wall time (benchmarks)
         self.logger = logging.getLogger(__name__)
 
     def ensure_connection(self, status_callback=None):
@@ -27,8 +43,11 @@ class LearningAgent:
             
             try:
                 import subprocess
-                # Start Ollama in background
-                subprocess.Popen(["ollama", "serve"], 
+                # Start Ollama in background (serving as many requests at once as the analysis sends)
+                env = dict(os.environ)
+                if self.num_parallel > 1:
+                    env.setdefault("OLLAMA_NUM_PARALLEL", str(self.num_parallel))
+                subprocess.Popen(["ollama", "serve"], env=env,
                                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
                 
                 # Wait for it to initialize (up to 8s)
@@ -48,10 +67,28 @@ class LearningAgent:
                 self.logger.error(f"Failed to auto-start Ollama: {e}")
                 return False
 
-    def _generate_json(self, prompt, context_text, subject=DEFAULT_SUBJECT, progress_callback=None):
-        """Generic method to generate JSON output with retries and robust validation."""
+    def _generate_json(self, prompt, context_text, subject=DEFAULT_SUBJECT, progress_callback=None, section_callback=None):
+        """
+        Generic method to generate JSON output with retries and robust validation.
+        With section_callback, each top-level member of the streamed object is
+        passed as (key, value) as soon as it's complete (once per key across retries).
+        """
         full_prompt = prompt.replace("{text}", context_text)
         system_role = get_system_role(subject)
+        emitted = set()
+        
+        # Keyed on the first attempt's options: a response that needed a retry is stored under the same key
+        options = {'temperature': 0.2, 'num_ctx': 24576}
+        cache_key = None
+        if self.cache:
+            cache_key = response_key(self.model, system_role, PROMPT_VERSION, prompt, context_text, options)
+            cached = None if self.bypass_cache else self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"LLM response cache hit ({cache_key[:8]})")
+                if section_callback and isinstance(cached, dict):
+                    for name, value in cached.items():
+                        section_callback(name, value)
+                return cached
         
         retries = 2
         for attempt in range(retries + 1):
@@ -69,6 +106,8 @@ class LearningAgent:
                 # Use streaming to provide real-time progress
                 content = ""
                 last_update_len = 0
+                sections = JsonSectionStream() if section_callback else None
+                started = time.perf_counter()
                 
                 stream = ollama.chat(
                     model=self.model, 
@@ -77,14 +116,24 @@ class LearningAgent:
                         {'role': 'user', 'content': full_prompt}
                     ], 
                     format='json', 
-                    options={'temperature': temp, 'num_ctx': 24576},
+                    options={**options, 'temperature': temp},
                     stream=True
                 )
                 
                 print(f"[DEBUG] Starting LLM stream for subject={subject}")
                 
                 for chunk in stream:
-                    content += chunk['message']['content']
+                    piece = chunk['message']['content']
+                    content += piece
+                    if sections:
+                        for key, value in sections.feed(piece):
+                            if key not in emitted:
+                                emitted.add(key)
+                                section_callback(key, value)
+                    if chunk.get('done'):
+                        self.usage_log.append({'prompt_tokens': chunk.get('prompt_eval_count') or 0,
+                                               'output_tokens': chunk.get('eval_count') or 0,
+                                               'seconds': time.perf_counter() - started})
                     
                     # Notify UI every ~50 chars for responsive feedback  
                     if progress_callback and len(content) - last_update_len > 50:
@@ -118,6 +167,8 @@ class LearningAgent:
                     continue
                 
                 self.logger.info(f"Successfully parsed non-empty JSON. Type: {type(parsed)}")
+                if cache_key:
+                    self.cache.put(cache_key, parsed)
                 return parsed
                 
             except Exception as e:
@@ -312,6 +363,54 @@ class LearningAgent:
                 partial_callback(items)
             return items
 
+    def _normalize_section(self, name, value, count=5):
+        """Shape one section of the combined response like the matching step method's result."""
+        if name == 'summary':
+            if isinstance(value, str):
+                return {'summary': value} if value.strip() else None
+            return value if isinstance(value, dict) and value.get('summary') else None
+        if name == 'vocabulary':
+            items = self._normalize_to_list(value, ['vocabulary', 'words', 'terms'])
+            return [i for i in items if isinstance(i, dict) and i.get('word')]
+        if name == 'questions':
+            items = self._normalize_to_list(value, ['questions', 'quiz'])
+            return [i for i in items if isinstance(i, dict) and i.get('question')][:count]
+        if name == 'flashcards':
+            items = self._normalize_to_list(value, ['flashcards', 'cards'])
+            return [i for i in items if isinstance(i, dict) and i.get('front') and i.get('back')]
+        return None
+
+    def generate_all(self, text, subject=DEFAULT_SUBJECT, count=5, progress_callback=None, section_callback=None):
+        """
+        Summary, vocabulary, questions and flashcards from a single LLM call, so
+        the transcript goes through prompt processing once instead of four times.
+        section_callback(name, value) fires as soon as each section is complete
+        in the stream, already normalized. Returns {name: value} for the
+        sections that came back; the caller runs the step method for any other.
+        """
+        sections = {}
+
+        def on_section(name, value):
+            if name not in COMBINED_SECTIONS or name in sections:
+                return
+            value = self._normalize_section(name, value, count)
+            if not value:
+                return
+            sections[name] = value
+            self.logger.info(f"Combined analysis: section '{name}' complete")
+            if section_callback:
+                section_callback(name, value)
+
+        prompt = get_combined_prompt(subject, count)
+        result = self._generate_json(prompt, text, subject, progress_callback, section_callback=on_section)
+        if isinstance(result, dict):
+            # Sections the stream scanner didn't see at top level (e.g. the model wrapped the object)
+            nested = next((v for v in result.values() if isinstance(v, dict) and 'vocabulary' in v), result)
+            for name in COMBINED_SECTIONS:
+                if name in nested:
+                    on_section(name, nested[name])
+        return sections
+
     def analyze_grammar(self, text, subject=DEFAULT_SUBJECT):
         """Analyze grammar and pragmatics (English only)."""
         prompt = get_grammar_prompt(subject)
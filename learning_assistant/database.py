@@ -39,6 +39,12 @@ class Database:
             c.execute("ALTER TABLE classes ADD COLUMN source TEXT")
         except sqlite3.OperationalError:
             pass
+
+        # Size/mtime of an upload's file, so a resumed draft can tell the file changed (migration)
+        try:
+            c.execute("ALTER TABLE classes ADD COLUMN source_signature TEXT")
+        except sqlite3.OperationalError:
+            pass
         
         # Vocabulary table
         c.execute('''CREATE TABLE IF NOT EXISTS vocabulary (
@@ -88,6 +94,19 @@ class Database:
             FOREIGN KEY(class_id) REFERENCES classes(id)
         )''')
         
+        # Timestamped transcript segments; classes.raw_text is derived from them when NULL
+        c.execute('''CREATE TABLE IF NOT EXISTS segments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            class_id INTEGER,
+            start REAL,
+            end REAL,
+            text TEXT,
+            avg_logprob REAL,
+            words_json TEXT, -- JSON list of [start, end, word], optional
+            FOREIGN KEY(class_id) REFERENCES classes(id)
+        )''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_segments_class ON segments(class_id, start)")
+        
         conn.commit()
         conn.close()
 
@@ -179,14 +198,37 @@ class Database:
         conn.close()
         return [dict(r) for r in rows]
 
-    def get_class(self, class_id):
+    def get_class(self, class_id, with_text=True):
+        """Class row; raw_text is joined from segments if it was never stored (with_text=False skips it)."""
         conn = self.get_connection()
         conn.row_factory = sqlite3.Row
         c = conn.cursor()
         c.execute("SELECT * FROM classes WHERE id = ?", (class_id,))
         row = c.fetchone()
         conn.close()
-        return dict(row) if row else None
+        if not row:
+            return None
+        data = dict(row)
+        if not with_text:
+            data.pop('raw_text')
+        elif data['raw_text'] is None:
+            data['raw_text'] = self.get_transcript_text(class_id)
+        return data
+
+    def update_class_duration(self, class_id, duration_sec):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute("UPDATE classes SET duration_sec = ? WHERE id = ?", (duration_sec, class_id))
+        conn.commit()
+        conn.close()
+
+    def delete_class(self, class_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute("DELETE FROM segments WHERE class_id = ?", (class_id,))
+        c.execute("DELETE FROM classes WHERE id = ?", (class_id,))
+        conn.commit()
+        conn.close()
     
     def get_recent_classes(self, limit=10):
         conn = self.get_connection()
@@ -197,6 +239,78 @@ class Database:
         conn.close()
         return [dict(r) for r in rows]
 
+    def add_segments(self, class_id, segments):
+        """
+        segments: list of Segment-like tuples (start, end, text, avg_logprob, words), committed in one transaction.
+        Returns the new row ids in the same order.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        ids = []
+        for s in segments:
+            c.execute('''INSERT INTO segments (class_id, start, end, text, avg_logprob, words_json)
+                         VALUES (?, ?, ?, ?, ?, ?)''',
+                      (class_id, s.start, s.end, s.text, s.avg_logprob, json.dumps(s.words) if s.words else None))
+            ids.append(c.lastrowid)
+        conn.commit()
+        conn.close()
+        return ids
+
+    def delete_segments(self, class_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute("DELETE FROM segments WHERE class_id = ?", (class_id,))
+        conn.commit()
+        conn.close()
+
+    def update_source_signature(self, class_id, signature):
+        """Size/mtime of the source file whose segments a draft holds (upload checkpoints)."""
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute("UPDATE classes SET source_signature = ? WHERE id = ?", (signature, class_id))
+        conn.commit()
+        conn.close()
+
+    def update_segment_text(self, segment_id, text):
+        """Replace the text of one segment (e.g. after refinement with a larger model)."""
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute("UPDATE segments SET text = ? WHERE id = ?", (text, segment_id))
+        conn.commit()
+        conn.close()
+
+    def get_segments(self, class_id, start=None, end=None):
+        """Segments of a class in time order, optionally only those overlapping [start, end) seconds."""
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        c = conn.cursor()
+        query = "SELECT start, end, text, avg_logprob, words_json FROM segments WHERE class_id = ?"
+        params = [class_id]
+        if start is not None:
+            query += " AND end > ?"
+            params.append(start)
+        if end is not None:
+            query += " AND start < ?"
+            params.append(end)
+        c.execute(query + " ORDER BY start", params)
+        rows = c.fetchall()
+        conn.close()
+        data = []
+        for r in rows:
+            seg = dict(r)
+            words_json = seg.pop('words_json')
+            seg['words'] = json.loads(words_json) if words_json else None
+            data.append(seg)
+        return data
+
+    def get_transcript_text(self, class_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute("SELECT text FROM segments WHERE class_id = ? ORDER BY start", (class_id,))
+        text = " ".join(row[0] for row in c.fetchall() if row[0])
+        conn.close()
+        return text
+
 if __name__ == "__main__":
     db = Database()
     print(f"Database initialized at {db.db_path}")
@@ -0,0 +1,81 @@
+import json
+import logging
+
+
+class JsonSectionStream:
+    """
+    Incremental scanner over a streamed JSON object.
+
+    feed() takes the next piece of LLM output and returns (key, value) for
+    every top-level member whose value became complete in it, so a caller
+    can save {"summary": ..., "vocabulary": [...], ...} section by section
+    while the rest is still being generated. Nested braces and brackets
+    inside strings are ignored; a member whose value doesn't parse is
+    skipped (the full document is still parsed at the end by the caller).
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "key"  # key -> colon -> value -> after -> key ...
+        self._key = None
+        self._start = None  # Buffer index where the current top-level token began
+        self.logger = logging.getLogger(__name__)
+
+    def feed(self, text):
+        self.buffer += text
+        out = []
+        while self._pos < len(self.buffer):
+            i = self._pos
+            ch = self.buffer[i]
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._end_token(i + 1, out)
+                continue
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state in ("key", "value") and self._start is None:
+                    self._start = i
+            elif ch in "{[":
+                if self._depth == 1 and self._state == "value" and self._start is None:
+                    self._start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1 and self._state == "value" and self._start is not None:
+                    self._end_token(i, out)  # Scalar ended by the closing brace
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value":
+                    self._end_token(i + 1, out)
+            elif self._depth == 1:
+                if ch == ":" and self._state == "colon":
+                    self._state, self._start = "value", None
+                elif ch == ",":
+                    if self._state == "value" and self._start is not None:
+                        self._end_token(i, out)  # Scalar (number, true, null...) ended by the comma
+                    self._state, self._start = "key", None
+                elif self._state == "value" and self._start is None and not ch.isspace():
+                    self._start = i
+        return out
+
+    def _end_token(self, end, out):
+        token = self.buffer[self._start:end].strip()
+        self._start = None
+        if self._state == "key":
+            self._key = json.loads(token)
+            self._state = "colon"
+            return
+        self._state = "after"
+        try:
+            out.append((self._key, json.loads(token)))
+        except ValueError as e:
+            self.logger.warning(f"Skipping unparsable section '{self._key}': {e}")
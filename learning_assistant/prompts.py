@@ -100,6 +100,10 @@ SUBJECT_CONFIGS = {
 # Default subject for backward compatibility
 DEFAULT_SUBJECT = "english"
 
+# Part of the LLM response cache key together with the prompt text itself. Bump when
+# cached responses must be regenerated without the prompt wording changing.
+PROMPT_VERSION = 1
+
 # =============================================================================
 # DYNAMIC PROMPT GENERATORS
 # =============================================================================
@@ -296,6 +300,65 @@ Output Format (JSON List):
 ]
 """
 
+COMBINED_SECTIONS = ("summary", "vocabulary", "questions", "flashcards")
+
+def get_combined_prompt(subject: str, count: int = 5) -> str:
+    """One prompt for summary, vocabulary, quiz and flashcards (the transcript is processed once)."""
+    config = SUBJECT_CONFIGS.get(subject, SUBJECT_CONFIGS[DEFAULT_SUBJECT])
+    quiz_style = config.get("quiz_style", "comprehension questions")
+    
+    if subject == "english":
+        lang_instruction = "in English"
+        summary_instruction = "A concise summary of the key topics covered, main grammar points explanations, and the general CEFR level (A1-C2) of the content."
+        summary_format = '''{
+        "summary": "...",
+        "topics": ["topic1", "topic2"],
+        "level": "B1"
+    }'''
+        vocabulary_instruction = "Important, useful or difficult vocabulary: phrasal verbs, idioms/collocations, academic or specific terms, words that seem to be the focus of the lesson. Ignore common basic words."
+        vocabulary_item = '''{"word": "look forward to", "definition": "To feel happy and excited about something that is going to happen", "example": "I look forward to hearing from you.", "type": "phrasal_verb", "level": "B1"}'''
+    else:
+        lang_instruction = "in Spanish"
+        summary_instruction = "A concise summary in Spanish of the key topics covered and main concepts explained."
+        summary_format = '''{
+        "summary": "A comprehensive summary of the content in Spanish...",
+        "topics": ["topic1", "topic2", "topic3"],
+        "key_concepts": ["concept1", "concept2"]
+    }'''
+        vocabulary_instruction = f"At least 5 of the most important technical terms, concepts and code syntax. Focus on: {config.get('vocabulary_focus', 'important terms')}, programming syntax, libraries, and reserved words. Definitions in Spanish."
+        vocabulary_item = '''{"word": "term/concept/syntax", "definition": "Clear definition in Spanish", "example": "Usage context", "code": "Optional code snippet if applicable", "type": "concept/code"}'''
+    
+    return f"""
+{config['system_role']}
+
+Transcript:
+{{text}}
+
+Instructions:
+Produce all of the following study material from the transcript above, in this order:
+1. "summary": {summary_instruction}
+2. "vocabulary": {vocabulary_instruction}
+3. "questions": {count} multiple-choice questions {lang_instruction} to test understanding, covering different parts of the content. Focus on: {quiz_style}
+4. "flashcards": 5-10 flashcards for spaced repetition {lang_instruction} covering the key concepts, definitions and important facts.
+
+Output format (a single JSON object with exactly these keys, in this order):
+{{
+    "summary": {summary_format},
+    "vocabulary": [
+        {vocabulary_item},
+        ...
+    ],
+    "questions": [
+        {{"question": "Question text...", "options": ["A", "B", "C", "D"], "correct_answer": "Option A", "explanation": "Why this is correct...", "type": "multiple_choice"}},
+        ...
+    ],
+    "flashcards": [
+        {{"front": "Concept or Question", "back": "Definition or Answer"}},
+        ...
+    ]
+}}
+"""
+
 def get_roleplay_prompt(subject: str) -> str:
     """Generate roleplay system prompt based on subject."""
     config = SUBJECT_CONFIGS.get(subject, SUBJECT_CONFIGS[DEFAULT_SUBJECT])
@@ -0,0 +1,37 @@
+"""
+Persistent cache of LLM JSON responses.
+
+Re-running the analysis of an unchanged session (or retrying after a crash)
+would otherwise regenerate every artifact. The key is a BLAKE2b digest of
+everything that determines the response: model name, system role, prompt
+template (its text and PROMPT_VERSION), the transcript chunk and the
+sampling options. Editing a prompt, switching models or changing the
+transcript misses; everything else is answered from disk without touching
+Ollama.
+
+Entries live in their own LRUStore file (data/llm_cache.db) because they
+are disposable.
+"""
+import hashlib
+import json
+import os
+
+from utils.lru_store import LRUStore
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "llm_cache.db")
+CACHE_MAX_MB = 50
+
+
+def response_key(model, system_role, template_version, template, chunk, options):
+    params = json.dumps({"model": model, "system_role": system_role, "template_version": template_version,
+                         "options": options}, sort_keys=True)
+    digest = hashlib.blake2b(digest_size=20)
+    for part in (params, template, chunk):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResponseCache(LRUStore):
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_MB * 2**20):
+        super().__init__(path, max_bytes, label="LLM response")
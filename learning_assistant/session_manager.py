@@ -1,31 +1,49 @@
 import threading
 import logging
 import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from .database import Database
-from .agent import LearningAgent
-from .prompts import SUBJECT_CONFIGS, DEFAULT_SUBJECT
+from .agent import LearningAgent, COMBINED_MAX_CHARS, ollama_parallelism
+from .prompts import SUBJECT_CONFIGS, DEFAULT_SUBJECT, COMBINED_SECTIONS
 
 class SessionManager:
-    def __init__(self):
+    def __init__(self, parallelism=None, analysis_mode="steps", response_cache=None, bypass_cache=False):
         self.db = Database()
         self.agent = None  # Lazy load
+        self.response_cache = response_cache  # Re-analysis of unchanged content is answered from disk
+        self.bypass_cache = bypass_cache
+        # "steps": one LLM call per artifact; "combined": summary, vocabulary, quiz and flashcards in one call
+        self.analysis_mode = analysis_mode
+        # Analysis steps run at once; more than the server's OLLAMA_NUM_PARALLEL would just queue there
+        self.parallelism = parallelism or ollama_parallelism()
         self.logger = logging.getLogger(__name__)
 
     def _get_agent(self):
         if not self.agent:
-            self.agent = LearningAgent()
+            self.agent = LearningAgent(num_parallel=self.parallelism, cache=self.response_cache,
+                                       bypass_cache=self.bypass_cache)
         return self.agent
 
-    def _analyze_session(self, class_id, text, subject=DEFAULT_SUBJECT, progress_callback=None):
-        """Run full analysis pipeline with progress updates (step, total, msg, percent)."""
+    def _analyze_session(self, class_id, text, subject=DEFAULT_SUBJECT, progress_callback=None, parallelism=None):
+        """
+        Run full analysis pipeline with progress updates (step, total, msg, percent).
+
+        The steps only depend on the transcript, so up to `parallelism` of them
+        run at once (default: self.parallelism, matched to the Ollama server's
+        OLLAMA_NUM_PARALLEL). With 1 they run one after another as before.
+        In "combined" mode summary, vocabulary, quiz and flashcards come from a
+        single LLM call and are saved section by section as they stream in.
+        """
         agent = self._get_agent()
         config = SUBJECT_CONFIGS.get(subject, SUBJECT_CONFIGS[DEFAULT_SUBJECT])
+        parallelism = max(1, parallelism or self.parallelism)
         
         # Determine number of steps based on subject features
         has_grammar = config.get("show_grammar", False)
         total_steps = 5 if has_grammar else 4
-        current_step = 0
         
         # Step names for user feedback (Norman: clear system status)
         step_names = [
@@ -37,13 +55,26 @@ class SessionManager:
         if has_grammar:
             step_names.append("🔍 Analizando gramática")
         
+        # Steps may finish in any order: progress is the number of finished steps
+        state_lock = threading.Lock()
+        finished = set()
+        
+        def done_count():
+            with state_lock:
+                return len(finished)
+        
+        def fraction(done):
+            # 1.0 tells the UI the analysis is over, so only the final report may send it
+            return min(done / total_steps, 0.99)
+        
         def report(step_idx, custom_msg=None):
-            percent = step_idx / total_steps
+            done = done_count()
+            percent = 1.0 if step_idx >= total_steps else fraction(done)
             step_name = step_names[step_idx] if step_idx < len(step_names) else "Finalizando"
             msg = custom_msg if custom_msg else f"Paso {step_idx + 1}/{total_steps}: {step_name}"
             print(f"[Analysis] {msg} ({int(percent*100)}%)")
             if progress_callback:
-                progress_callback(msg, percent, step_idx + 1, total_steps)
+                progress_callback(msg, percent, done + 1, total_steps)
         
         report(0, f"🚀 Iniciando análisis de {config['name']}...")
         
@@ -53,12 +84,22 @@ class SessionManager:
             self.logger.error("Ollama connection failed. Aborting analysis.")
             return
 
-        # Define sub-task callback for streaming LLM progress
-        def agent_callback(sub_msg):
-            # sub_msg e.g. "Generando... (200 chars)" or "Chunk 1/4"
+        # Define sub-task callback for streaming LLM progress (one per step, so concurrent steps report their own)
+        def agent_callback_for(step_idx, label=None):
+            def agent_callback(sub_msg):
+                # sub_msg e.g. "Generando... (200 chars)" or "Chunk 1/4"
+                if progress_callback:
+                    done = done_count()
+                    step_label = label or f"Paso {step_idx+1}/{total_steps}: {step_names[step_idx]}"
+                    full_msg = f"{step_label} | {sub_msg}"
+                    progress_callback(full_msg, fraction(done), done + 1, total_steps)
+            return agent_callback
+
+        def notify_ready(msg, dtype):
+            # Notify UI to unlock/refresh immediately
             if progress_callback:
-                full_msg = f"Paso {current_step+1}/{total_steps}: {step_names[current_step]} | {sub_msg}"
-                progress_callback(full_msg, current_step / total_steps, current_step + 1, total_steps)
+                done = done_count()
+                progress_callback(msg, fraction(done), done + 1, total_steps, data_type=dtype)
 
         # Helper for incremental saving (Streaming)
         def save_incremental(dtype, items):
@@ -80,108 +121,162 @@ class SessionManager:
                 conn.close()
             
             print(f"[DEBUG] save_incremental: Saved {len(items)} {dtype} items to DB")
-            
-            # Notify UI to unlock/refresh immediately
-            if progress_callback:
-                print(f"[DEBUG] save_incremental: Calling progress_callback with data_type={dtype}")
-                progress_callback(f"{dtype.title()} listo ✅", current_step / total_steps, current_step, total_steps, data_type=dtype)
+            print(f"[DEBUG] save_incremental: Calling progress_callback with data_type={dtype}")
+            notify_ready(f"{dtype.title()} listo ✅", dtype)
 
         # 1. Summary & Level
-        try:
-            report(0)
-            summary_data = agent.generate_summary(text, subject, progress_callback=agent_callback)
-            if summary_data:
-                level = summary_data.get('level') if subject == 'english' else None
-                self.db.update_class_summary(class_id, summary_data.get('summary'), level)
-                # Notify UI that summary is ready
-                if progress_callback:
-                    progress_callback("Resumen listo ✅", 0.25, 1, total_steps, data_type='summary')
-        except Exception as e:
-            self.logger.error(f"Error in summary: {e}")
-        
-        current_step = 1
+        def run_summary(step_idx):
+            try:
+                summary_data = agent.generate_summary(text, subject, progress_callback=agent_callback_for(step_idx))
+                if summary_data:
+                    level = summary_data.get('level') if subject == 'english' else None
+                    self.db.update_class_summary(class_id, summary_data.get('summary'), level)
+                    # Notify UI that summary is ready
+                    notify_ready("Resumen listo ✅", 'summary')
+            except Exception as e:
+                self.logger.error(f"Error in summary: {e}")
 
         # 2. Vocabulary / Technical Terms
-        try:
-            report(1)
-            vocab_chunks_saved = False
-            
-            def vocab_partial(items):
-                nonlocal vocab_chunks_saved
-                vocab_chunks_saved = True
-                save_incremental('vocabulary', items)
-
-            vocab = agent.extract_vocabulary(text, subject, progress_callback=agent_callback, partial_callback=vocab_partial)
-            
-            # If partials weren't called (no chunks), save and notify now
-            if vocab and not vocab_chunks_saved:
-                self.db.save_vocabulary(class_id, vocab)
-                if progress_callback:
-                    progress_callback("Vocabulario listo ✅", 0.4, 2, total_steps, data_type='vocabulary')
-        except Exception as e:
-            self.logger.error(f"Error in vocab: {e}")
+        def run_vocabulary(step_idx):
+            try:
+                vocab_chunks_saved = False
+                
+                def vocab_partial(items):
+                    nonlocal vocab_chunks_saved
+                    vocab_chunks_saved = True
+                    save_incremental('vocabulary', items)
 
-        current_step = 2
+                vocab = agent.extract_vocabulary(text, subject, progress_callback=agent_callback_for(step_idx),
+                                                 partial_callback=vocab_partial)
+                
+                # If partials weren't called (no chunks), save and notify now
+                if vocab and not vocab_chunks_saved:
+                    self.db.save_vocabulary(class_id, vocab)
+                    notify_ready("Vocabulario listo ✅", 'vocabulary')
+            except Exception as e:
+                self.logger.error(f"Error in vocab: {e}")
 
         # 3. Questions (Quiz)
-        try:
-            report(2)
-            questions_chunks_saved = False
-            def questions_partial(items):
-                nonlocal questions_chunks_saved
-                questions_chunks_saved = True
-                save_incremental('questions', items)
-
-            questions = agent.generate_questions(text, subject, count=5, progress_callback=agent_callback, partial_callback=questions_partial)
-            
-            # If partials weren't called (no chunks), save and notify now
-            if questions and not questions_chunks_saved:
-                self.db.save_questions(class_id, questions)
-                if progress_callback:
-                    progress_callback("Quiz listo ✅", 0.6, 3, total_steps, data_type='questions')
-        except Exception as e:
-            self.logger.error(f"Error in questions: {e}")
+        def run_questions(step_idx):
+            try:
+                questions_chunks_saved = False
+                def questions_partial(items):
+                    nonlocal questions_chunks_saved
+                    questions_chunks_saved = True
+                    save_incremental('questions', items)
 
-        current_step = 3
+                questions = agent.generate_questions(text, subject, count=5, progress_callback=agent_callback_for(step_idx),
+                                                     partial_callback=questions_partial)
+                
+                # If partials weren't called (no chunks), save and notify now
+                if questions and not questions_chunks_saved:
+                    self.db.save_questions(class_id, questions)
+                    notify_ready("Quiz listo ✅", 'questions')
+            except Exception as e:
+                self.logger.error(f"Error in questions: {e}")
 
         # 4. Flashcards
-        try:
-            report(3)
-            cards_chunks_saved = False
-            def cards_partial(items):
-                nonlocal cards_chunks_saved
-                cards_chunks_saved = True
-                save_incremental('flashcards', items)
-
-            cards = agent.create_flashcards(text, subject, progress_callback=agent_callback, partial_callback=cards_partial)
-            
-            # If partials weren't called (no chunks), save and notify now
-            if cards and not cards_chunks_saved:
-                conn = self.db.get_connection()
-                c = conn.cursor()
-                for card in cards:
-                    c.execute("INSERT INTO flashcards (class_id, front, back) VALUES (?, ?, ?)",
-                              (class_id, card['front'], card['back']))
-                conn.commit()
-                conn.close()
-                if progress_callback:
-                    progress_callback("Flashcards listo ✅", 0.8, 4, total_steps, data_type='flashcards')
-        except Exception as e:
-            self.logger.error(f"Error in flashcards: {e}")
-            
-        current_step = 4
+        def run_flashcards(step_idx):
+            try:
+                cards_chunks_saved = False
+                def cards_partial(items):
+                    nonlocal cards_chunks_saved
+                    cards_chunks_saved = True
+                    save_incremental('flashcards', items)
+
+                cards = agent.create_flashcards(text, subject, progress_callback=agent_callback_for(step_idx),
+                                                partial_callback=cards_partial)
+                
+                # If partials weren't called (no chunks), save and notify now
+                if cards and not cards_chunks_saved:
+                    conn = self.db.get_connection()
+                    c = conn.cursor()
+                    for card in cards:
+                        c.execute("INSERT INTO flashcards (class_id, front, back) VALUES (?, ?, ?)",
+                                  (class_id, card['front'], card['back']))
+                    conn.commit()
+                    conn.close()
+                    notify_ready("Flashcards listo ✅", 'flashcards')
+            except Exception as e:
+                self.logger.error(f"Error in flashcards: {e}")
 
         # 5. Grammar & Context (English only)
-        if has_grammar:
+        def run_grammar(step_idx):
             try:
-                report(4)
                 grammar_points = agent.analyze_grammar(text, subject)
                 if grammar_points:
                     self.db.save_grammar_points(class_id, grammar_points)
             except Exception as e:
                 self.logger.error(f"Error in grammar analysis: {e}")
 
-            current_step += 1
+        steps = [run_summary, run_vocabulary, run_questions, run_flashcards]
+        if has_grammar:
+            steps.append(run_grammar)
+
+        def run_step(step_idx):
+            report(step_idx)
+            started = time.perf_counter()
+            try:
+                steps[step_idx](step_idx)
+            finally:
+                with state_lock:
+                    finished.add(step_idx)
+                self.logger.info(f"Analysis step {step_idx + 1}/{total_steps} done in {time.perf_counter() - started:.1f}s")
+
+        # 1-4 from one LLM call (analysis_mode "combined"); a section that doesn't come back runs as its own step
+        section_steps = {name: idx for idx, name in enumerate(COMBINED_SECTIONS)}
+
+        def run_combined():
+            label = "⚡ Resumen, vocabulario, quiz y flashcards en una sola llamada"
+            report(0, label)
+            started = time.perf_counter()
+
+            def on_section(name, value):
+                try:
+                    if name == 'summary':
+                        level = value.get('level') if subject == 'english' else None
+                        self.db.update_class_summary(class_id, value.get('summary'), level)
+                        notify_ready("Resumen listo ✅", 'summary')
+                    else:
+                        save_incremental(name, value)
+                except Exception as e:
+                    self.logger.error(f"Error saving combined section {name}: {e}")
+                finally:
+                    with state_lock:
+                        finished.add(section_steps[name])
+
+            try:
+                sections = agent.generate_all(text, subject, count=5, progress_callback=agent_callback_for(0, label),
+                                              section_callback=on_section)
+            except Exception as e:
+                self.logger.error(f"Error in combined analysis: {e}")
+                sections = {}
+            self.logger.info(f"Combined analysis: {len(sections)}/{len(COMBINED_SECTIONS)} sections "
+                             f"in {time.perf_counter() - started:.1f}s")
+            for name in COMBINED_SECTIONS:
+                if name not in sections:
+                    self.logger.warning(f"Combined analysis returned no {name}; running its step")
+                    run_step(section_steps[name])
+
+        combined = self.analysis_mode == "combined" and len(text) <= COMBINED_MAX_CHARS
+        if combined:
+            jobs = [run_combined]
+        else:
+            jobs = [partial(run_step, step_idx) for step_idx in range(len(COMBINED_SECTIONS))]
+        if has_grammar:
+            jobs.append(partial(run_step, len(COMBINED_SECTIONS)))
+
+        started = time.perf_counter()
+        if parallelism == 1:
+            for job in jobs:
+                job()
+        else:
+            # Summary is submitted first, so it's among the first to unlock in the StudyPanel
+            with ThreadPoolExecutor(max_workers=min(parallelism, len(jobs)), thread_name_prefix="analysis") as pool:
+                for future in [pool.submit(job) for job in jobs]:
+                    future.result()
+        self.logger.info(f"Analysis finished in {time.perf_counter() - started:.1f}s "
+                         f"({'combined' if combined else 'steps'}, parallelism {parallelism})")
         
         report(total_steps, "¡Análisis completado! 🎉")
 
@@ -195,6 +290,19 @@ class SessionManager:
             
         return self.db.save_class(title, raw_text, duration, subject, source)
 
+    def start_segment_session(self, title=None, subject=DEFAULT_SUBJECT, source=None):
+        """Create an empty draft whose transcript is appended segment by segment (append_segments)."""
+        if not title:
+            config = SUBJECT_CONFIGS.get(subject, SUBJECT_CONFIGS[DEFAULT_SUBJECT])
+            title = f"{config['icon']} {config['name']} - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        return self.db.save_class(title, None, 0, subject, source)
+
+    def append_segments(self, class_id, segments):
+        """Store segments; returns their row ids."""
+        if segments:
+            return self.db.add_segments(class_id, segments)
+        return []
+
     def start_analysis(self, class_id, progress_callback=None):
         """Resume analysis for an existing session."""
         info = self.db.get_class(class_id)
@@ -214,7 +322,7 @@ class SessionManager:
     def get_class_data(self, class_id):
         """Retrieve all data for a class."""
         data = {}
-        data['info'] = self.db.get_class(class_id)
+        data['info'] = self.db.get_class(class_id, with_text=False)
         
         conn = self.db.get_connection()
         conn.row_factory = sqlite3.Row
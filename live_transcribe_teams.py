@@ -11,33 +11,13 @@ import time
 import pyaudiowpatch as pyaudio
 from vosk import Model, KaldiRecognizer
 
+from transcription.resampler import StreamResampler, float_to_pcm16
+
 # Vosk works best at 16kHz
 VOSK_SAMPLE_RATE = 16000
 CHUNK_SIZE = 4000  # ~250ms at 16kHz
 
 
-def resample_audio(data: bytes, orig_rate: int, target_rate: int, channels: int) -> bytes:
-    """Resample audio from orig_rate to target_rate using simple linear interpolation"""
-    import numpy as np
-    
-    # Convert bytes to numpy array (int16)
-    audio = np.frombuffer(data, dtype=np.int16)
-    
-    # If stereo, convert to mono by averaging channels
-    if channels == 2:
-        audio = audio.reshape(-1, 2).mean(axis=1).astype(np.int16)
-    
-    # Resample if needed
-    if orig_rate != target_rate:
-        # Calculate new length
-        new_length = int(len(audio) * target_rate / orig_rate)
-        # Use linear interpolation for resampling
-        indices = np.linspace(0, len(audio) - 1, new_length)
-        audio = np.interp(indices, np.arange(len(audio)), audio).astype(np.int16)
-    
-    return audio.tobytes()
-
-
 def main():
     print("=" * 60)
     print("  LIVE TRANSCRIPTION - Teams/System Audio")
@@ -84,6 +64,8 @@ def main():
         
         # Calculate chunk size for device rate
         device_chunk = int(CHUNK_SIZE * device_rate / VOSK_SAMPLE_RATE)
+        # Keeps filter state across reads, so chunk edges stay continuous
+        resampler = StreamResampler(device_rate, VOSK_SAMPLE_RATE, device_channels)
         
         print("\n[3/3] Iniciando transcripción...")
         print("-" * 60)
@@ -108,7 +90,7 @@ def main():
                     data = stream.read(device_chunk, exception_on_overflow=False)
                     
                     # Resample to 16kHz mono for Vosk
-                    audio_16k = resample_audio(data, device_rate, VOSK_SAMPLE_RATE, device_channels)
+                    audio_16k = float_to_pcm16(resampler.process_pcm16(data))
                     
                     # Process with Vosk
                     if recognizer.AcceptWaveform(audio_16k):
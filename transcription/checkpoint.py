@@ -0,0 +1,60 @@
+"""
+Crash-safe progress for long file transcriptions.
+
+An upload job creates its draft session up front and appends segments to
+the `segments` table as they are produced, in small transactions every
+`flush_interval` seconds, so a crash or close loses at most that much work.
+On the next run the job loads what was committed and resumes decoding at
+`resume_offset`, the end of the last stored segment.
+
+The draft also records the file's size and mtime; if the file changed
+since, the stored segments belong to other audio and are discarded, so the
+job starts over instead of resuming mid-file.
+"""
+import logging
+import os
+import time
+
+from .segments import Segment
+
+CHECKPOINT_FLUSH_INTERVAL = 5.0  # Seconds between SQLite commits
+
+
+def file_signature(filepath):
+    stat = os.stat(filepath)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class SegmentCheckpoint:
+    def __init__(self, db, class_id, filepath=None, flush_interval=CHECKPOINT_FLUSH_INTERVAL):
+        self.db = db
+        self.class_id = class_id
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+        if filepath:
+            signature = file_signature(filepath)
+            stored = (db.get_class(class_id, with_text=False) or {}).get("source_signature")
+            if stored != signature:
+                if stored is not None:
+                    self.logger.info(f"{filepath} changed since its draft was started; transcribing from the start")
+                db.delete_segments(class_id)
+                db.update_source_signature(class_id, signature)
+        self.segments = [Segment(**row) for row in db.get_segments(class_id)]
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    @property
+    def resume_offset(self):
+        return self.segments[-1].end if self.segments else 0.0
+
+    def add(self, segment):
+        self.segments.append(segment)
+        self._pending.append(segment)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.db.add_segments(self.class_id, self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
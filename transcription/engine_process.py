@@ -0,0 +1,186 @@
+"""
+Whisper inference in a separate process.
+
+Inside the Tk process, faster-whisper's Python-side work (feature
+extraction, VAD, segment assembly) competes with the UI for the GIL, so the
+window stutters while a large model decodes. InferenceProcess moves the
+model into a child process and exposes the same
+`transcribe(audio, **kwargs) -> (segments, info)` call as WhisperModel, so
+LiveTranscriber and StreamingDecoder use it unchanged.
+
+Audio travels through a mirrored ring buffer in multiprocessing.shared_memory:
+the parent writes each chunk once and the child decodes a zero-copy view of
+it. Only (request id, ring offset, length, options) goes over the request
+queue, and segments come back as small tuples on the result queue.
+
+If the child dies (crash, OOM) or hangs past the request's timeout, it is
+terminated and the call is retried once on a freshly started process. close() sends a sentinel, waits for the child and
+releases the shared memory; it also runs at interpreter exit.
+"""
+import atexit
+import itertools
+import logging
+import multiprocessing as mp
+import queue
+import threading
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .ring_buffer import AudioRingBuffer
+
+SAMPLE_RATE = 16000
+ENGINE_RING_DURATION = 60.0  # Longest chunk the live path can send is 30 s (coalesce limit)
+ENGINE_START_TIMEOUT = 600.0  # First start may download the model
+ENGINE_POLL = 0.5  # Seconds between liveness checks while waiting for a result
+ENGINE_REQUEST_TIMEOUT = 30.0  # Base seconds a transcribe request may take before the child counts as hung...
+ENGINE_TIMEOUT_PER_SECOND = 10.0  # ...plus this much per second of audio (a slow CPU with a large model)
+SHUTDOWN_TIMEOUT = 5.0
+
+RemoteSegment = namedtuple("RemoteSegment", "start end text avg_logprob no_speech_prob words")
+RemoteWord = namedtuple("RemoteWord", "start end word probability")
+RemoteInfo = namedtuple("RemoteInfo", "language language_probability duration")
+
+
+class EngineCrashed(RuntimeError):
+    pass
+
+
+def load_whisper(size, device, compute_type):
+    from faster_whisper import WhisperModel
+    return WhisperModel(size, device=device, compute_type=compute_type)
+
+
+def _engine_main(loader, model_args, shm_name, capacity, requests, results):
+    """Child process: load the model, then serve transcribe requests until a None sentinel."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    data = np.ndarray((capacity * 2,), dtype=np.float32, buffer=shm.buf)
+    try:
+        model = loader(*model_args)
+        results.put(("ready", None, None))
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            req_id, abs_start, n, kwargs = request
+            start = abs_start % capacity
+            try:
+                segments, info = model.transcribe(data[start:start + n], **kwargs)
+                out = [RemoteSegment(s.start, s.end, s.text, s.avg_logprob, s.no_speech_prob,
+                                     [RemoteWord(w.start, w.end, w.word, w.probability) for w in s.words]
+                                     if s.words else None)
+                       for s in segments]
+                results.put((req_id, out, RemoteInfo(info.language, info.language_probability, info.duration)))
+            except Exception as e:
+                results.put((req_id, None, str(e)))
+    finally:
+        del data
+        shm.close()
+
+
+class InferenceProcess:
+    def __init__(self, size, device="cpu", compute_type="int8", loader=load_whisper,
+                 ring_duration=ENGINE_RING_DURATION):
+        self.model_args = (size, device, compute_type)
+        self.loader = loader  # Must be a module-level function (pickled for the spawned child)
+        self.capacity = int(SAMPLE_RATE * ring_duration)
+        self.restarts = 0
+        self.logger = logging.getLogger(__name__)
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._process = None
+        self._shm = shared_memory.SharedMemory(create=True, size=self.capacity * 2 * 4)
+        self._ring = AudioRingBuffer(self.capacity, np.ndarray((self.capacity * 2,), dtype=np.float32,
+                                                               buffer=self._shm.buf))
+        self._closed = False
+        atexit.register(self.close)
+
+    @property
+    def size(self):
+        return self.model_args[0]
+
+    def start(self):
+        """Spawn the child and wait until its model is loaded."""
+        self._requests = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._process = self._ctx.Process(
+            target=_engine_main, daemon=True,
+            args=(self.loader, self.model_args, self._shm.name, self.capacity, self._requests, self._results))
+        self._process.start()
+        self._wait(("ready",), ENGINE_START_TIMEOUT)
+        self.logger.info(f"Inference process ready (pid {self._process.pid}, model {self.model_args})")
+
+    def _wait(self, expected_ids, timeout):
+        """Next result whose id is in `expected_ids`; raises EngineCrashed if the child dies first."""
+        waited = 0.0
+        while True:
+            try:
+                result = self._results.get(timeout=ENGINE_POLL)
+            except queue.Empty:
+                waited += ENGINE_POLL
+                if not self._process.is_alive():
+                    raise EngineCrashed(f"Inference process exited with code {self._process.exitcode}")
+                if timeout is not None and waited >= timeout:
+                    raise EngineCrashed("Inference process did not answer in time")
+                continue
+            if result[0] in expected_ids:
+                return result
+
+    def _restart(self):
+        self.restarts += 1
+        self.logger.warning(f"Restarting inference process (restart #{self.restarts})")
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+        if self._process is not None:
+            self._process.join(SHUTDOWN_TIMEOUT)
+        self.start()
+
+    def transcribe(self, audio, **kwargs):
+        """Same contract as WhisperModel.transcribe for in-memory 16 kHz float32 audio."""
+        audio = np.asarray(audio, dtype=np.float32)
+        if len(audio) > self.capacity:
+            raise ValueError(f"Chunk of {len(audio) / SAMPLE_RATE:.0f}s exceeds the shared ring")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Inference process is closed")
+            if self._process is None:
+                self.start()
+            elif not self._process.is_alive():
+                self._restart()
+            timeout = ENGINE_REQUEST_TIMEOUT + len(audio) / SAMPLE_RATE * ENGINE_TIMEOUT_PER_SECOND
+            for attempt in (1, 2):
+                abs_start = self._ring.written
+                self._ring.write(audio)
+                req_id = next(self._ids)
+                self._requests.put((req_id, abs_start, len(audio), kwargs))
+                try:
+                    _, segments, info = self._wait((req_id,), timeout)
+                    break
+                except EngineCrashed as e:
+                    if attempt == 2:
+                        if self._process.is_alive():
+                            self._process.terminate()  # Hung: the next call restarts it
+                        raise
+                    self.logger.warning(f"Inference request failed: {e}")
+                    self._restart()  # Also ends a child that hangs without exiting
+        if segments is None:
+            raise RuntimeError(info)
+        return iter(segments), info
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._process is not None:
+                if self._process.is_alive():
+                    self._requests.put(None)
+                    self._process.join(SHUTDOWN_TIMEOUT)
+                if self._process.is_alive():
+                    self._process.terminate()
+                    self._process.join(SHUTDOWN_TIMEOUT)
+            del self._ring
+            self._shm.close()
+            self._shm.unlink()
@@ -0,0 +1,175 @@
+"""
+Streaming speech engines with a common accept(audio) -> results interface.
+
+A SpeechEngine consumes consecutive blocks of 16 kHz mono float32 audio and
+returns a list of (kind, text, start, end) results for each block: "partial"
+results replace the live preview, "final" ones are committed transcript
+lines. start/end are the line's span in seconds of audio fed to the engine
+(since it was created or reset), or None if the engine can't tell.
+flush() ends the current utterance (silence or end of stream).
+
+- WhisperEngine: faster-whisper through StreamingDecoder (LocalAgreement-2),
+  re-decoding every `step` seconds (every block with step=0). It is the
+  live "streaming" mode.
+- VoskEngine: Kaldi recognizer with native partial results and endpointing,
+  at a fraction of Whisper's CPU cost (for low-end machines).
+
+LiveTranscriber runs WhisperEngine in its "streaming" mode and any other
+engine in its "engine" mode; benchmarks/bench_engines.py compares them on
+the same fixture audio.
+"""
+import json
+from functools import lru_cache
+
+import numpy as np
+
+from .resampler import float_to_pcm16
+from .streaming import StreamingDecoder, words_to_text
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+SAMPLE_RATE = 16000
+SENTENCE_END = (".", "?", "!", "…")
+MAX_LINE_WORDS = 25  # Flush a transcript line even without punctuation
+ENGINES = ("whisper", "vosk")
+
+
+class SpeechEngine:
+    name = "engine"
+    sample_rate = SAMPLE_RATE
+
+    def accept(self, audio):
+        """Feed one block of audio; returns a list of (kind, text, start, end) results."""
+        raise NotImplementedError
+
+    def flush(self):
+        """End of utterance: returns the remaining results as finals."""
+        return []
+
+    def reset(self):
+        pass
+
+
+class WhisperEngine(SpeechEngine):
+    name = "whisper"
+
+    def __init__(self, model, language="es", step=1.0, beam_size=5):
+        self.model = model
+        self.step_samples = int(step * SAMPLE_RATE)
+        self.decoder = StreamingDecoder(model, language, SAMPLE_RATE, beam_size=beam_size)
+        self._pending = []
+        self._pending_samples = 0
+        self._line = []
+
+    @property
+    def language(self):
+        return self.decoder.language
+
+    @language.setter
+    def language(self, value):
+        self.decoder.language = value
+
+    @property
+    def beam_size(self):
+        return self.decoder.beam_size
+
+    @beam_size.setter
+    def beam_size(self, value):
+        self.decoder.beam_size = value  # The live RTF controller lowers it when falling behind
+
+    def accept(self, audio):
+        self._pending.append(np.asarray(audio, dtype=np.float32))
+        self._pending_samples += len(audio)
+        if self._pending_samples < self.step_samples:
+            return []
+        self._insert_pending()
+        committed, tentative = self.decoder.process()
+        results = self._commit(committed)
+        preview = words_to_text(self._line + list(tentative))
+        if preview:
+            results.append(("partial", preview, None, None))
+        return results
+
+    def _insert_pending(self):
+        audio = self._pending[0] if len(self._pending) == 1 else np.concatenate(self._pending)
+        self.decoder.insert_audio(audio)
+        self._pending, self._pending_samples = [], 0
+
+    def _commit(self, words):
+        """Add committed words to the current line; a sentence end or a long line closes it."""
+        results = []
+        for word in words:
+            self._line.append(word)
+            if word[2].strip().endswith(SENTENCE_END) or len(self._line) >= MAX_LINE_WORDS:
+                results += self._final()
+        return results
+
+    def _final(self):
+        line, self._line = self._line, []
+        text = words_to_text(line)
+        # Word times come from the decoder, which counts exactly the audio fed to this engine
+        return [("final", text, line[0][0], line[-1][1])] if text else []
+
+    def flush(self):
+        results = []
+        if self._pending:
+            self._insert_pending()
+            results += self._commit(self.decoder.process()[0])
+        self._line.extend(self.decoder.end_utterance())
+        return results + self._final()
+
+    def reset(self):
+        self.decoder = StreamingDecoder(self.model, self.language, SAMPLE_RATE, beam_size=self.decoder.beam_size)
+        self._pending, self._pending_samples, self._line = [], 0, []
+
+
+@lru_cache(maxsize=2)
+def load_vosk_model(path):
+    """Vosk models take seconds to load; keep them across live sessions."""
+    if not VOSK_AVAILABLE:
+        raise RuntimeError("vosk no está instalado")
+    return vosk.Model(path)
+
+
+class VoskEngine(SpeechEngine):
+    name = "vosk"
+
+    def __init__(self, model_path="model"):
+        self.model = load_vosk_model(model_path)
+        self.language = None  # Fixed by the Vosk model; kept for interface parity
+        self.reset()
+
+    def accept(self, audio):
+        if self.recognizer.AcceptWaveform(float_to_pcm16(audio)):
+            return self._final(self.recognizer.Result())
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+        return [("partial", partial, None, None)] if partial else []
+
+    def _final(self, result_json):
+        result = json.loads(result_json)
+        text = result.get("text", "").strip()
+        if not text:
+            return []
+        words = result.get("result") or ()  # Word times (SetWords), seconds of audio fed to the recognizer
+        if words:
+            return [("final", text, words[0]["start"], words[-1]["end"])]
+        return [("final", text, None, None)]
+
+    def flush(self):
+        return self._final(self.recognizer.FinalResult())
+
+    def reset(self):
+        self.recognizer = vosk.KaldiRecognizer(self.model, SAMPLE_RATE)
+        self.recognizer.SetWords(True)
+
+
+def create_engine(kind, model=None, language="es", vosk_model_path="model"):
+    if kind == "vosk":
+        return VoskEngine(vosk_model_path)
+    if kind == "whisper":
+        return WhisperEngine(model, language)
+    raise ValueError(f"Unknown speech engine: {kind}")
@@ -0,0 +1,140 @@
+"""
+Uploaded-file transcription, shared by the UI upload button and batch jobs.
+
+transcribe_file() picks a strategy (choose_strategy) and always returns
+(duration_seconds, iterator of Segment in file order), so callers can
+stream fragments to the UI without caring how they were produced:
+
+- parallel: process pool over silence-aligned parts (CPU only, workers > 1)
+- batched: faster-whisper's BatchedInferencePipeline, decoding `batch_size`
+  VAD segments per forward pass; skipped when free RAM is too low
+- sequential: one WhisperModel.transcribe() stream (registry-cached model)
+
+With `stream_decode` the sequential and batched strategies read the file
+in fixed windows (stream_decode.iter_windows) instead of decoding it whole,
+so memory stays flat for multi-hour recordings; the last words of each
+window are passed as the next window's prompt to keep context.
+
+`start_offset` (seconds) skips audio already transcribed by an interrupted
+run; returned timestamps and duration are always relative to the whole file.
+
+`report` is the job runner's progress callback; it is called during setup
+(whole-file decode, VAD) so a cancelled job stops there too. Callers
+should close() the returned iterator when they stop early.
+"""
+import ctypes
+import logging
+import os
+import sys
+
+from .model_registry import detect_device
+from .parallel_file import SAMPLE_RATE, transcribe_parallel
+from .segments import from_whisper
+from .stream_decode import iter_windows, probe_duration
+
+# Rough peak working set of a batched decode on top of the model itself
+BATCHED_BASE_MB = 1024
+BATCHED_PER_ITEM_MB = 96
+PROMPT_CHARS = 200  # Tail of the previous window's text used as the next window's prompt
+
+logger = logging.getLogger(__name__)
+
+
+def available_memory_mb():
+    """Free physical memory in MB, or None if it can't be determined."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 2**20
+    except ImportError:
+        pass
+    try:
+        if sys.platform == "win32":
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullAvailPhys / 2**20
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def fit_batch_size(batch_size, free_mb=None):
+    """Largest batch size <= `batch_size` that fits in free RAM (1 = use the sequential path)."""
+    free_mb = available_memory_mb() if free_mb is None else free_mb
+    if free_mb is None:
+        return batch_size
+    while batch_size > 1 and BATCHED_BASE_MB + batch_size * BATCHED_PER_ITEM_MB > free_mb:
+        batch_size //= 2
+    return max(1, batch_size)
+
+
+def choose_strategy(workers=1, batch_size=1):
+    """
+    (strategy, effective batch size) that transcribe_file will use:
+    "parallel", "batched" or "sequential". Callers that key anything on the
+    output (the transcript cache) pass the result on to transcribe_file, so
+    the free-memory check behind the batch size is done once.
+    """
+    device, _ = detect_device()
+    if workers > 1 and device == "cpu":
+        return "parallel", 1
+    if batch_size > 1:
+        fitted = fit_batch_size(batch_size)
+        if fitted < batch_size:
+            logger.info(f"Low free memory: batch size {batch_size} -> {fitted}")
+        if fitted > 1:
+            try:
+                from faster_whisper import BatchedInferencePipeline  # noqa: F401
+            except ImportError:
+                logger.warning("faster-whisper without BatchedInferencePipeline; using sequential decode")
+            else:
+                return "batched", fitted
+    return "sequential", 1
+
+
+def _transcribe_windows(transcribe, filepath, start_offset, options):
+    prompt = None
+    for window_start, audio in iter_windows(filepath, sample_rate=SAMPLE_RATE, start_offset=start_offset):
+        segments, _ = transcribe(audio, initial_prompt=prompt, **options)
+        text = []
+        for s in segments:
+            segment = from_whisper(s, window_start)
+            text.append(segment.text)
+            yield segment
+        if text:
+            prompt = " ".join(text)[-PROMPT_CHARS:]
+
+
+def transcribe_file(registry, filepath, size, language, workers=1, batch_size=1, beam_size=5, start_offset=0.0,
+                    stream_decode=False, report=None, strategy=None):
+    device, compute_type = detect_device()
+    strategy, batch_size = strategy or choose_strategy(workers, batch_size)
+    if strategy == "parallel":
+        return transcribe_parallel(filepath, size, language, workers=workers, compute_type=compute_type,
+                                   beam_size=beam_size, start_offset=start_offset, report=report)
+
+    model = registry.get(size, device, compute_type)
+    transcribe = model.transcribe
+    options = dict(language=language, beam_size=beam_size, vad_filter=True)
+    if strategy == "batched":
+        from faster_whisper import BatchedInferencePipeline
+        transcribe = BatchedInferencePipeline(model=model).transcribe
+        options["batch_size"] = batch_size
+
+    if stream_decode:
+        return probe_duration(filepath), _transcribe_windows(transcribe, filepath, start_offset, options)
+
+    audio = filepath
+    if start_offset > 0:
+        from faster_whisper.audio import decode_audio
+        audio = decode_audio(filepath, sampling_rate=SAMPLE_RATE)[int(start_offset * SAMPLE_RATE):]
+        if report:
+            report(0.0)
+    segments, info = transcribe(audio, **options)
+    return start_offset + info.duration, (from_whisper(s, start_offset) for s in segments)
@@ -0,0 +1,203 @@
+"""
+Persistent queue of file-transcription jobs.
+
+Jobs are stored in data/jobs.json so a week of recordings can be enqueued
+once and survive restarts (jobs that were running when the app closed go
+back to "pending"). A fixed number of worker threads (`concurrency`) pull
+jobs in FIFO order; the actual work is done by the `runner` callable the
+app supplies, which shares one registry model across jobs.
+
+runner(job, report) must return the created class_id. `report(fraction)`
+updates the job's progress and raises JobCancelled once cancel() was
+called, so runners get cooperative cancellation for free.
+
+`jobs` is shared with the worker threads: status changes happen under the
+queue's lock, and other threads iterate over snapshot() instead of `jobs`.
+A job id may sit in the pending queue more than once (cancelled, then
+retried); a worker only runs it if it can claim it from PENDING.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+JOBS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "jobs.json")
+MAX_FINISHED_JOBS = 100  # Finished jobs kept for the panel's history
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".flac", ".ogg", ".m4a", ".wma", ".aac", ".opus", ".mp4", ".mkv", ".webm")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    FIELDS = ("id", "path", "subject", "status", "progress", "error", "class_id", "created_at")
+
+    def __init__(self, path, subject, id=None, status=PENDING, progress=0.0, error=None,
+                 class_id=None, created_at=None):
+        self.id = id or uuid.uuid4().hex[:12]
+        self.path = path
+        self.subject = subject
+        self.status = status
+        self.progress = progress
+        self.error = error
+        self.class_id = class_id
+        self.created_at = created_at or time.time()
+        self.cancel_event = threading.Event()
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+
+def audio_files_in(folder):
+    """Audio/video files directly inside `folder`, sorted by name (recording order)."""
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                  if name.lower().endswith(AUDIO_EXTENSIONS))
+
+
+class JobQueue:
+    def __init__(self, runner, on_update=None, concurrency=1, path=JOBS_PATH):
+        self.runner = runner
+        self.on_update = on_update or (lambda job: None)
+        self.concurrency = max(1, concurrency)
+        self.path = path
+        self.jobs = {}  # id -> Job, insertion ordered
+        self._pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = []
+        self.logger = logging.getLogger(__name__)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for data in json.load(f):
+                    job = Job.from_dict(data)
+                    if job.status == RUNNING:  # Interrupted by a crash/close
+                        job.status, job.progress = PENDING, 0.0
+                    self.jobs[job.id] = job
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable job queue: {e}")
+
+    def _save(self):
+        with self._lock:
+            finished = [j for j in self.jobs.values() if j.status in (DONE, FAILED, CANCELLED)]
+            for job in finished[:-MAX_FINISHED_JOBS]:
+                del self.jobs[job.id]
+            data = [job.to_dict() for job in self.jobs.values()]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def snapshot(self):
+        """The jobs in insertion order, safe to iterate while workers update the queue."""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def start(self):
+        """Start the workers and pick up pending jobs left from a previous run."""
+        for job in self.snapshot():
+            if job.status == PENDING:
+                self._pending.put(job.id)
+        for _ in range(self.concurrency):
+            worker = threading.Thread(target=self._worker, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def add(self, paths, subject):
+        jobs = [Job(path, subject) for path in paths]
+        with self._lock:
+            for job in jobs:
+                self.jobs[job.id] = job
+        self._save()
+        for job in jobs:
+            self._pending.put(job.id)
+            self.on_update(job)
+        return jobs
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job or job.status not in (PENDING, RUNNING):
+                return
+            job.cancel_event.set()
+            pending = job.status == PENDING  # Running jobs are marked by their worker
+            if pending:
+                job.status = CANCELLED
+        if pending:
+            self._finish(job, CANCELLED)
+
+    def retry(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job or job.status not in (FAILED, CANCELLED):
+                return
+            job.status, job.progress, job.error = PENDING, 0.0, None
+            job.cancel_event = threading.Event()
+        self._save()
+        self._pending.put(job.id)
+        self.on_update(job)
+
+    def set_class_id(self, job, class_id):
+        """Persist the draft session a running job writes into, so a restart resumes it."""
+        job.class_id = class_id
+        self._save()
+
+    def is_busy(self):
+        return any(job.status in (PENDING, RUNNING) for job in self.snapshot())
+
+    def _finish(self, job, status, error=None):
+        with self._lock:
+            job.status, job.error = status, error
+        self._save()
+        self.on_update(job)
+
+    def _claim(self, job_id):
+        """PENDING -> RUNNING for one worker only; None if the job is gone, cancelled or already claimed."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job or job.status != PENDING:
+                return None
+            job.status, job.progress = RUNNING, 0.0
+            return job
+
+    def _worker(self):
+        while True:
+            job = self._claim(self._pending.get())
+            if not job:
+                continue
+            self._save()
+            self.on_update(job)
+
+            def report(fraction, job=job):
+                if job.cancel_event.is_set():
+                    raise JobCancelled()
+                job.progress = min(1.0, fraction)
+                self.on_update(job)
+
+            try:
+                job.class_id = self.runner(job, report)
+                job.progress = 1.0
+                self._finish(job, DONE)
+            except JobCancelled:
+                self._finish(job, CANCELLED)
+            except Exception as e:
+                self.logger.exception(f"Job {job.name} failed")
+                self._finish(job, FAILED, str(e))
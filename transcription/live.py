@@ -0,0 +1,286 @@
+"""
+Live transcription pipeline, independent of the Tk UI.
+
+    capture thread:  AudioSource -> StreamResampler -> AudioRingBuffer
+                     -> EnergyGate -> ChunkQueue
+    inference thread: ChunkQueue -> WhisperModel.transcribe -> out_queue
+
+Results are posted to `out_queue` as the same ("partial" | "final" |
+"status" | "rtf" | "error", text) tuples TranscriptionApp._check_queue consumes, so
+the pipeline can run inside the app or headlessly from a benchmark script.
+A "final" carries (tag, text) instead of text: the tag ("<line_tag>_<n>")
+names the line for later refinement.
+
+Each "final" line can also be handed to `on_segment(segment, tag)` as a
+Segment whose start/end are seconds of captured audio since the session
+began, so the app can store timestamped segments as they are produced. The
+tag is the one posted with the line, so both sides agree even when storing
+a segment fails.
+
+Decoding modes:
+- "chunked": independent 3 s windows with 0.5 s overlap.
+- "streaming": 1 s steps fed to a WhisperEngine (engines.py), i.e. a
+  StreamingDecoder (LocalAgreement-2); only words stable across two
+  hypotheses become "final" text, and the uncommitted tail is shown as
+  "partial".
+- "engine": 0.25 s blocks fed to another SpeechEngine (e.g. Vosk), whose own
+  partial/final results are forwarded; `model` is unused. The energy gate is
+  skipped: the engine sees every block and does its own endpointing, so word
+  onsets are never cut.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+from .ring_buffer import AudioRingBuffer
+from .resampler import StreamResampler
+from .pipeline import ChunkQueue
+from .vad_gate import EnergyGate
+from .engines import WhisperEngine
+from .rtf_controller import RealtimeController
+from .metrics import LiveMetrics
+from .segments import Segment
+
+SAMPLE_RATE = 16000
+CHUNK_DURATION = 3.0
+BUFFER_DURATION = 0.5
+OVERLAP_DURATION = 0.5
+RING_DURATION = 30.0  # Seconds of 16 kHz audio kept in the live ring buffer
+LIVE_QUEUE_SIZE = 4  # Chunks waiting for inference before backpressure kicks in
+LIVE_QUEUE_POLICY = "coalesce"  # or "drop_oldest"
+MAX_COALESCE_DURATION = 30.0  # Whisper's native window; longer merges drop the oldest chunk
+STREAM_STEP_DURATION = 1.0  # Streaming mode: new audio per re-decode step
+ENGINE_STEP_DURATION = 0.25  # Engine mode: audio per accept() call
+
+
+class SessionClock:
+    """
+    Maps engine time (seconds of audio fed to an engine) to session time.
+    Gated silence is never fed, so the two drift apart; each fed chunk records
+    where it starts in both.
+    """
+    def __init__(self, max_marks=256):
+        self.marks = deque(maxlen=max_marks)  # (fed seconds, session seconds) at the start of each fed chunk
+        self.fed = 0.0
+
+    def feed(self, session_start, samples):
+        self.marks.append((self.fed, session_start))
+        self.fed += samples / SAMPLE_RATE
+
+    def session_time(self, t):
+        for fed, session in reversed(self.marks):
+            if t >= fed:
+                return session + (t - fed)
+        return self.marks[0][1] if self.marks else t
+
+
+class LiveTranscriber:
+    def __init__(self, model, source, out_queue, language="es", queue_policy=LIVE_QUEUE_POLICY,
+                 mode="chunked", on_segment=None, on_audio=None, engine=None, line_tag="line"):
+        if engine is not None:
+            mode = "engine"
+        if mode not in ("chunked", "streaming", "engine"):
+            raise ValueError(f"Unknown live mode: {mode}")
+        if mode == "streaming":
+            # step=0: decode every chunk, the RTF controller sets the step length
+            engine = WhisperEngine(model, language, step=0)
+        self.engine = engine
+        self.mode = mode
+        self.model = model
+        self.source = source
+        self.out_queue = out_queue
+        self.language = language  # Read per chunk, so it can change mid-session
+        self.queue_policy = queue_policy
+        self.on_segment = on_segment  # Called from the inference thread
+        self.line_tag = line_tag  # Prefix of the final lines' tags (unique per session in the app)
+        self.on_audio = on_audio  # Called from the capture thread with each 16 kHz block (e.g. LiveRefiner.feed)
+        self.is_running = False
+        self.logger = logging.getLogger(__name__)
+
+        self.gate = EnergyGate(SAMPLE_RATE)
+        if mode == "streaming":
+            self.controller = RealtimeController(STREAM_STEP_DURATION, min_chunk=0.5, max_chunk=3.0, chunk_step=0.5)
+        elif mode == "engine":
+            # Engines pace themselves; the controller only reports RTF
+            self.controller = RealtimeController(ENGINE_STEP_DURATION, min_chunk=ENGINE_STEP_DURATION,
+                                                 max_chunk=ENGINE_STEP_DURATION)
+        else:
+            self.controller = RealtimeController(CHUNK_DURATION)
+        self.metrics = LiveMetrics()
+        self.chunks = None
+        self.finals = 0
+        self.audio_samples = 0  # 16 kHz samples captured this session
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        """Capture until stop() is called or the source runs dry; blocks."""
+        self.is_running = True
+        self.source.open(BUFFER_DURATION)
+        rate, channels = self.source.sample_rate, self.source.channels
+        buffer_frames = int(rate * BUFFER_DURATION)
+        # The streaming decoder and engines keep their own context, so steps don't need to overlap
+        overlap_frames = 0 if self.mode != "chunked" else int(SAMPLE_RATE * OVERLAP_DURATION)
+        self.out_queue.put(("ready", "Escuchando..."))
+
+        # Preallocated once: the capture loop never grows or re-slices a buffer
+        ring = AudioRingBuffer(int(SAMPLE_RATE * RING_DURATION))
+        resampler = StreamResampler(rate, SAMPLE_RATE, channels)
+        # Capture only reads and enqueues; Whisper runs on its own thread so a
+        # slow transcribe() can never stall source.read() into a device overflow
+        self.chunks = ChunkQueue(maxsize=LIVE_QUEUE_SIZE, policy=self.queue_policy, overlap=overlap_frames,
+                                 max_coalesce=int(SAMPLE_RATE * MAX_COALESCE_DURATION))
+        worker = self._inference_worker if self.mode == "chunked" else self._engine_worker
+        inference = threading.Thread(target=worker, daemon=True)
+        inference.start()
+        gate = self.gate
+        # External engines endpoint on their own and need every block, including onsets and pauses
+        gated = self.mode != "engine"
+        try:
+            while self.is_running:
+                data = self.source.read(buffer_frames)
+                if not data:
+                    # End of a file/synthetic source: flush the tail as a last chunk
+                    tail = ring.latest(ring.available)
+                    if len(tail) and (not gated or gate.accept(tail)):
+                        start = (self.audio_samples - len(tail)) / SAMPLE_RATE
+                        self.chunks.put(tail.copy(), (time.perf_counter(), start))
+                    break
+                audio = resampler.process_pcm16(data)
+                ring.write(audio)
+                self.audio_samples += len(audio)
+                if self.on_audio:
+                    self.on_audio(audio)
+                # Chunk length is re-read every time: the RTF controller may change it
+                chunk_frames = int(SAMPLE_RATE * self.controller.chunk_duration)
+                # Engine blocks are shorter than one device read, so drain every complete chunk
+                while (chunk := ring.next_chunk(chunk_frames, overlap_frames)) is not None:
+                    # Stamp = (capture time, chunk start in session audio); the unread overlap ends it
+                    start = (self.audio_samples - ring.available + overlap_frames - len(chunk)) / SAMPLE_RATE
+                    stamp = (time.perf_counter(), start)
+                    was_open = gate.is_open
+                    # Silent windows never reach Whisper (or its Silero VAD)
+                    if not gated or gate.accept(chunk):
+                        self.chunks.put(chunk.copy(), stamp)  # The ring view is overwritten by later reads
+                    elif was_open and self.mode != "chunked":
+                        self.chunks.put(chunk[:0].copy(), stamp)  # Empty chunk = end of utterance
+                self._update_health(ring)
+                if gate.checked and not gate.is_open and not self.chunks.qsize():
+                    self.out_queue.put(("partial", f"🔇 Silencio ({gate.skip_ratio:.0%} omitido)"))
+                elif self.mode == "chunked":
+                    secs = (ring.available + self.chunks.pending_samples()) / SAMPLE_RATE
+                    self.out_queue.put(("partial", f"Procesando... {secs:.1f}s"))
+        finally:
+            self.source.close()
+            self.chunks.close()  # Lets the inference worker drain the backlog and exit
+        inference.join()
+        self.is_running = False
+
+        self._update_health(ring)
+        self.metrics.maybe_log(force=True)
+        self.logger.info(f"Live session: gate={gate.stats()} queue={self.chunks.stats()}")
+        stats = self.chunks.stats()
+        if stats["dropped_chunks"]:
+            lost = stats["dropped_samples"] / SAMPLE_RATE
+            self.out_queue.put(("status", f"⚠️ Se descartaron {lost:.1f}s de audio (CPU insuficiente)"))
+
+    def is_backlogged(self):
+        """True while live inference has queued audio or is near its real-time limit."""
+        if self.is_running and self.chunks is not None and self.chunks.qsize():
+            return True
+        return self.is_running and self.controller.rtf is not None and self.controller.rtf > self.controller.high
+
+    def _update_health(self, ring):
+        """Sample queue depth and copy loss counters into the metrics (once per read)."""
+        stats = self.chunks.stats()
+        self.metrics.sample_queue(stats["depth"])
+        self.metrics.update_counters(
+            device_overflows=self.source.overflows, ring_overflow_samples=ring.overflow_samples,
+            dropped_chunks=stats["dropped_chunks"], dropped_samples=stats["dropped_samples"],
+            skipped_chunks=self.gate.skipped)
+        self.metrics.maybe_log()
+
+    def _emit_final(self, text, captured_at, ended_at, start=None, end=None, avg_logprob=None):
+        tag = f"{self.line_tag}_{self.finals}"
+        self.out_queue.put(("final", (tag, text)))
+        self.metrics.final_emitted(captured_at, ended_at)
+        self.finals += 1
+        if self.on_segment and start is not None:
+            try:
+                self.on_segment(Segment(start, end, text, avg_logprob), tag)
+            except Exception as e:
+                self.logger.error(f"Storing live segment failed: {e}")
+
+    def _observe(self, samples, elapsed):
+        """Feed one inference timing to the RTF controller and publish the result."""
+        if self.controller.observe(samples / SAMPLE_RATE, elapsed):
+            self.logger.info(f"Real-time controller adjusted: {self.controller.describe()}")
+        self.out_queue.put(("rtf", self.controller.describe()))
+
+    def _inference_worker(self):
+        """Consume audio chunks from the capture thread and transcribe them."""
+        last_text = ""
+        while True:
+            item = self.chunks.get()
+            if item is None:
+                break
+            chunk, (captured_at, start) = item
+            try:
+                started = time.perf_counter()
+                segments, _ = self.model.transcribe(
+                    chunk, language=self.language, beam_size=self.controller.beam_size,
+                    vad_filter=True, vad_parameters=dict(min_silence_duration_ms=500))
+                segments = list(segments)
+                text = " ".join(s.text.strip() for s in segments).strip()
+                ended = time.perf_counter()
+                self.metrics.record_inference(captured_at, started, ended)
+                self._observe(len(chunk), ended - started)
+                if text and text != last_text:
+                    avg_logprob = sum(s.avg_logprob for s in segments) / len(segments)
+                    self._emit_final(text, captured_at, ended, start, start + len(chunk) / SAMPLE_RATE, avg_logprob)
+                    last_text = text
+            except Exception as e:
+                self.out_queue.put(("error", str(e)))
+
+    def _engine_worker(self):
+        """Feed chunks to the speech engine and forward its partial/final results."""
+        clock = SessionClock()  # Engine times skip gated silence; map them back to session audio
+        span = {"start": None, "end": 0.0}  # Session-audio span of the current line, for engines without times
+
+        while True:
+            item = self.chunks.get()
+            chunk, (captured_at, start) = item if item is not None else (None, (time.perf_counter(), None))
+            try:
+                if chunk is None or not len(chunk):
+                    results = self.engine.flush()  # Silence or end of stream
+                else:
+                    self.engine.language = self.language
+                    if self.mode == "streaming":
+                        self.engine.beam_size = self.controller.beam_size
+                    clock.feed(start, len(chunk))
+                    if span["start"] is None:
+                        span["start"] = start
+                    span["end"] = start + len(chunk) / SAMPLE_RATE
+                    started = time.perf_counter()
+                    results = self.engine.accept(chunk)
+                    ended = time.perf_counter()
+                    self.metrics.record_inference(captured_at, started, ended)
+                    # Whisper re-decodes its whole buffer, but only the new audio counts toward keeping up
+                    self._observe(len(chunk), ended - started)
+                for kind, text, line_start, line_end in results:
+                    if kind == "final":
+                        if line_start is not None:
+                            line_start, line_end = clock.session_time(line_start), clock.session_time(line_end)
+                        else:
+                            line_start = span["start"] if span["start"] is not None else span["end"]
+                            line_end = span["end"]
+                        self._emit_final(text, captured_at, time.perf_counter(), line_start, line_end)
+                        span["start"] = None
+                    else:
+                        self.out_queue.put(("partial", text[-80:]))
+            except Exception as e:
+                self.out_queue.put(("error", str(e)))
+            if chunk is None:
+                break
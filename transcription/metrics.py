@@ -0,0 +1,108 @@
+"""
+Latency and audio-health instrumentation for the live pipeline.
+
+Each chunk is stamped when capture completes it; the inference worker adds
+start/end stamps and the UI reports when the resulting "final" line is
+inserted. Finals reach the UI in FIFO order, so LiveMetrics keeps a queue of
+pending capture stamps instead of changing the (type, text) message shape.
+
+All timings are time.perf_counter() seconds; histograms keep the most
+recent `window` samples and report p50/p95/p99.
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+METRICS_LOG_INTERVAL = 30.0  # Seconds between structured "live_metrics" log records
+
+
+class RollingHistogram:
+    def __init__(self, window=500):
+        self.values = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value):
+        self.values.append(value)
+        self.count += 1
+
+    def percentiles(self):
+        if not self.values:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(np.fromiter(self.values, dtype=np.float64), (50, 95, 99))
+        return {"count": self.count, "p50": round(p50, 4), "p95": round(p95, 4), "p99": round(p99, 4)}
+
+
+class LiveMetrics:
+    HISTOGRAMS = ("queue_wait", "inference", "to_ui", "end_to_end", "queue_depth")
+
+    def __init__(self, window=500):
+        self.hist = {name: RollingHistogram(window) for name in self.HISTOGRAMS}
+        self.counters = {"device_overflows": 0, "ring_overflow_samples": 0,
+                         "dropped_chunks": 0, "dropped_samples": 0, "skipped_chunks": 0}
+        self._pending_ui = deque()
+        self._lock = threading.Lock()
+        self._last_log = time.perf_counter()
+        self.logger = logging.getLogger(__name__)
+
+    def record_inference(self, captured_at, started_at, ended_at):
+        with self._lock:
+            self.hist["queue_wait"].add(started_at - captured_at)
+            self.hist["inference"].add(ended_at - started_at)
+
+    def final_emitted(self, captured_at, ended_at):
+        """A "final" message for a chunk captured at `captured_at` was queued for the UI."""
+        with self._lock:
+            self._pending_ui.append((captured_at, ended_at))
+
+    def final_displayed(self):
+        """Called by the UI thread right after inserting a "final" line."""
+        now = time.perf_counter()
+        with self._lock:
+            if not self._pending_ui:
+                return
+            captured_at, ended_at = self._pending_ui.popleft()
+            self.hist["to_ui"].add(now - ended_at)
+            self.hist["end_to_end"].add(now - captured_at)
+
+    def sample_queue(self, depth):
+        with self._lock:
+            self.hist["queue_depth"].add(depth)
+
+    def update_counters(self, **values):
+        with self._lock:
+            self.counters.update(values)
+
+    def snapshot(self):
+        with self._lock:
+            data = {name: h.percentiles() for name, h in self.hist.items()}
+            data.update(self.counters)
+        return data
+
+    def maybe_log(self, force=False):
+        """Emit a structured log record every METRICS_LOG_INTERVAL seconds."""
+        now = time.perf_counter()
+        if not force and now - self._last_log < METRICS_LOG_INTERVAL:
+            return
+        self._last_log = now
+        self.logger.info("live_metrics %s", json.dumps(self.snapshot()))
+
+    def summary_text(self):
+        """Compact multi-line text for the debug overlay."""
+        snap = self.snapshot()
+
+        def fmt(name, scale=1000.0, unit="ms"):
+            h = snap[name]
+            if not h["count"]:
+                return f"{name}: –"
+            return (f"{name}: p50 {h['p50'] * scale:.0f} / p95 {h['p95'] * scale:.0f} / "
+                    f"p99 {h['p99'] * scale:.0f} {unit}")
+
+        lines = [fmt("end_to_end"), fmt("queue_wait"), fmt("inference"), fmt("to_ui"),
+                 fmt("queue_depth", scale=1.0, unit="chunks"),
+                 f"overflows: device {snap['device_overflows']} · ring {snap['ring_overflow_samples']} samples · "
+                 f"dropped {snap['dropped_chunks']} chunks · skipped {snap['skipped_chunks']}"]
+        return "\n".join(lines)
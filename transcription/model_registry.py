@@ -0,0 +1,127 @@
+"""
+LRU registry of loaded WhisperModel instances.
+
+Models are keyed by (size, device, compute_type) and kept within an
+approximate memory budget, so switching Rápido/Balanceado/Preciso and back
+doesn't reload multi-GB weights. Loading is single-flight: if the live
+worker and the file worker ask for the same model at once, only one of
+them constructs it and the other waits for the result.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+
+import numpy as np
+
+# Approximate resident size (MB) of each model in float16; int8 is about half
+MODEL_SIZES_MB = {
+    "tiny": 75, "base": 145, "small": 490, "medium": 1530,
+    "large-v1": 3100, "large-v2": 3100, "large-v3": 3100, "turbo": 1620,
+}
+COMPUTE_FACTOR = {"float32": 2.0, "float16": 1.0, "int8_float16": 0.55, "int8": 0.5, "int8_float32": 0.55}
+MODEL_MEMORY_BUDGET_MB = int(os.environ.get("WHISPER_MODEL_BUDGET_MB", 4000))
+
+
+@lru_cache(maxsize=None)
+def detect_device():
+    """(device, compute_type) for this machine: CUDA float16 if available, else CPU int8."""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda", "float16"
+    except Exception:
+        pass
+    return "cpu", "int8"
+
+
+def estimate_size_mb(size, compute_type):
+    return MODEL_SIZES_MB.get(size, 1530) * COMPUTE_FACTOR.get(compute_type, 1.0)
+
+
+class ModelRegistry:
+    def __init__(self, memory_budget_mb=MODEL_MEMORY_BUDGET_MB, loader=None):
+        self.memory_budget_mb = memory_budget_mb
+        self._loader = loader or self._load_whisper
+        self._models = OrderedDict()  # key -> (model, size_mb), least recently used first
+        self._loading = {}            # key -> Future, for single-flight loads
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _load_whisper(size, device, compute_type):
+        from faster_whisper import WhisperModel
+        return WhisperModel(size, device=device, compute_type=compute_type)
+
+    def key(self, size, device=None, compute_type=None):
+        if device is None or compute_type is None:
+            default_device, default_compute = detect_device()
+            device = device or default_device
+            compute_type = compute_type or default_compute
+        return (size, device, compute_type)
+
+    def is_loaded(self, size, device=None, compute_type=None):
+        with self._lock:
+            return self.key(size, device, compute_type) in self._models
+
+    def get(self, size, device=None, compute_type=None):
+        """Return a cached model or load it (once, even with concurrent callers)."""
+        key = self.key(size, device, compute_type)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+            future = self._loading.get(key)
+            leader = future is None
+            if leader:
+                future = self._loading[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            self.logger.info(f"Loading Whisper model {key}")
+            model = self._loader(*key)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            size_mb = estimate_size_mb(key[0], key[2])
+            self._evict_for(size_mb)
+            self._models[key] = (model, size_mb)
+            del self._loading[key]
+        future.set_result(model)
+        return model
+
+    def _evict_for(self, size_mb):
+        """Drop least recently used models until `size_mb` fits the budget (lock held)."""
+        used = sum(s for _, s in self._models.values())
+        while self._models and used + size_mb > self.memory_budget_mb:
+            key, (_, evicted_mb) = self._models.popitem(last=False)
+            used -= evicted_mb
+            self.logger.info(f"Evicted Whisper model {key} (~{evicted_mb:.0f} MB)")
+
+    def warm_up(self, model, sample_rate=16000):
+        """
+        Run two tiny decodes so the first real caption doesn't pay one-time costs:
+        silence through the VAD path (loads Silero) and a second of faint noise
+        without VAD (initialises the CTranslate2 encoder/decoder kernels).
+        """
+        silence = np.zeros(sample_rate, dtype=np.float32)
+        noise = np.random.default_rng(0).standard_normal(sample_rate).astype(np.float32) * 1e-3
+        for audio, vad in ((silence, True), (noise, False)):
+            segments, _ = model.transcribe(audio, beam_size=1, language="es", vad_filter=vad,
+                                           without_timestamps=True)
+            for _ in segments:
+                pass
+
+    def evict(self, size, device=None, compute_type=None):
+        with self._lock:
+            self._models.pop(self.key(size, device, compute_type), None)
+
+    def loaded(self):
+        with self._lock:
+            return list(self._models)
@@ -0,0 +1,116 @@
+"""
+Parallel long-file transcription across a process pool.
+
+The file is decoded once, Silero VAD finds the silences, and the audio is
+cut at the silence nearest to each of N evenly spaced boundaries, so no
+word is split and parts have similar length. Each worker process loads its
+own WhisperModel with a fixed `cpu_threads` budget and transcribes whole
+parts; results are yielded strictly in order, with timestamps shifted back
+to file time, as soon as every earlier part is done.
+
+Closing the returned iterator early (job cancelled, error) cancels the
+parts not started yet and terminates the workers instead of waiting for
+the running parts. Decoding and VAD happen before the pool exists;
+`report` (the job runner's progress callback, which raises to cancel) is
+called between those phases, and every CANCEL_POLL_INTERVAL while waiting
+for a part, so a cancel doesn't wait for a part that takes minutes.
+
+CPU only: a single GPU is better served by one decoding stream.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .segments import from_whisper
+
+SAMPLE_RATE = 16000
+MIN_PART_DURATION = 60.0  # Shorter parts don't amortise per-call overhead
+PARTS_PER_WORKER = 2      # A few more parts than workers keeps the pool busy at the end
+CANCEL_POLL_INTERVAL = 0.5  # Seconds between report() calls while a part is decoding
+
+_worker_model = None
+
+
+def plan_splits(speech, total_samples, n_parts):
+    """
+    Cut [0, total_samples) into up to `n_parts` ranges at silence midpoints.
+    `speech` is Silero's list of {"start", "end"} sample offsets.
+    """
+    if n_parts <= 1 or total_samples == 0:
+        return [(0, total_samples)]
+    gaps = np.array([(a["end"] + b["start"]) // 2 for a, b in zip(speech, speech[1:])], dtype=np.int64)
+    cuts = []
+    for k in range(1, n_parts):
+        target = k * total_samples // n_parts
+        if len(gaps):
+            target = int(gaps[np.argmin(np.abs(gaps - target))])
+        if (not cuts or target > cuts[-1]) and 0 < target < total_samples:
+            cuts.append(target)
+    bounds = [0] + cuts + [total_samples]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _init_worker(size, device, compute_type, cpu_threads):
+    global _worker_model
+    from faster_whisper import WhisperModel
+    _worker_model = WhisperModel(size, device=device, compute_type=compute_type,
+                                 cpu_threads=cpu_threads, num_workers=1)
+
+
+def _transcribe_part(audio, offset, options):
+    segments, _ = _worker_model.transcribe(audio, **options)
+    base = offset / SAMPLE_RATE
+    return [from_whisper(s, base) for s in segments]
+
+
+def default_workers():
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+def transcribe_parallel(filepath, size, language, workers=None, cpu_threads=None,
+                        compute_type="int8", beam_size=5, start_offset=0.0, report=None):
+    """Return (duration, iterator of Segment in file order), skipping the first `start_offset` seconds."""
+    from faster_whisper.audio import decode_audio
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    report = report or (lambda fraction: None)
+    workers = workers or default_workers()
+    cpu_threads = cpu_threads or max(1, (os.cpu_count() or workers) // workers)
+    report(0.0)
+    audio = decode_audio(filepath, sampling_rate=SAMPLE_RATE)
+    duration = len(audio) / SAMPLE_RATE
+    skip = int(start_offset * SAMPLE_RATE)
+    audio = audio[skip:]
+
+    total = skip + len(audio)
+    report(skip / total if total else 0.0)
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    report(skip / total if total else 0.0)
+    n_parts = max(1, min(int(len(audio) / SAMPLE_RATE // MIN_PART_DURATION), workers * PARTS_PER_WORKER))
+    parts = plan_splits(speech, len(audio), n_parts)
+    options = dict(language=language, beam_size=beam_size, vad_filter=True)
+
+    def results():
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(parts)), initializer=_init_worker,
+                                   initargs=(size, "cpu", compute_type, cpu_threads))
+        finished = False
+        try:
+            futures = [pool.submit(_transcribe_part, audio[a:b], skip + a, options) for a, b in parts]
+            # In order: part i is yielded as soon as it and every part before it is done
+            for (a, _), future in zip(parts, futures):
+                while not wait([future], timeout=CANCEL_POLL_INTERVAL).done:
+                    report((skip + a) / total)  # Raises JobCancelled, which closes the pool below
+                yield from future.result()
+            finished = True
+        finally:
+            processes = list((pool._processes or {}).values())  # shutdown() forgets them
+            pool.shutdown(wait=finished, cancel_futures=True)
+            if not finished:
+                # Running parts can't be cancelled; stop their processes instead of waiting minutes
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.join()
+
+    return duration, results()
@@ -0,0 +1,104 @@
+"""
+Bounded hand-off between the audio capture thread and the inference worker.
+
+Capture must never block on Whisper, so when inference falls behind the
+queue applies an explicit backpressure policy instead of letting the device
+buffer overflow:
+
+- "coalesce": merge the new chunk into the newest queued one (minus the
+  shared overlap), so no speech is lost; the worker just decodes a longer
+  window. Once a merged chunk reaches `max_coalesce` samples it falls back
+  to dropping the oldest chunk.
+- "drop_oldest": discard the oldest queued chunk.
+
+Empty chunks are end-of-utterance markers. They are always queued, and
+audio arriving right after one is queued behind it instead of merged into
+it (up to 2 x maxsize items), so the flush and the marker's stamp survive.
+
+Every dropped chunk and sample is counted. Items carry an optional capture
+timestamp; a coalesced item keeps the oldest one, so latency is measured
+from the earliest audio it contains.
+"""
+import threading
+from collections import deque
+
+import numpy as np
+
+POLICIES = ("coalesce", "drop_oldest")
+
+
+class ChunkQueue:
+    def __init__(self, maxsize=4, policy="coalesce", overlap=0, max_coalesce=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.overlap = overlap
+        self.max_coalesce = max_coalesce
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.coalesced_count = 0
+        self.dropped_chunks = 0
+        self.dropped_samples = 0
+
+    def put(self, chunk, stamp=None):
+        """Enqueue a chunk without ever blocking the caller."""
+        with self._cond:
+            if self._closed:
+                return
+            self.put_count += 1
+            # Empty chunks are end-of-utterance markers: merging them would lose them, and they cost nothing
+            # After a marker, merging would lose the flush and give the audio the marker's start stamp
+            behind_marker = self._items and not len(self._items[-1][0]) and len(self._items) < 2 * self.maxsize
+            if len(self._items) >= self.maxsize and len(chunk) and not behind_marker:
+                if self.policy == "coalesce" and self._can_coalesce(chunk):
+                    newest, newest_stamp = self._items[-1]
+                    self._items[-1] = (np.concatenate([newest, chunk[self.overlap:]]), newest_stamp)
+                    self.coalesced_count += 1
+                    self._cond.notify()
+                    return
+                dropped, _ = self._items.popleft()
+                self.dropped_chunks += 1
+                self.dropped_samples += len(dropped)
+            self._items.append((chunk, stamp))
+            self._cond.notify()
+
+    def _can_coalesce(self, chunk):
+        if self.max_coalesce is None:
+            return True
+        return len(self._items[-1][0]) + len(chunk) - self.overlap <= self.max_coalesce
+
+    def get(self, timeout=None):
+        """Next (chunk, stamp), or None once the queue is closed and drained (or on timeout)."""
+        with self._cond:
+            while not self._items and not self._closed:
+                if not self._cond.wait(timeout):
+                    return None
+            return self._items.popleft() if self._items else None
+
+    def close(self):
+        """Stop accepting chunks; get() returns None after the backlog is drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def qsize(self):
+        with self._cond:
+            return len(self._items)
+
+    def pending_samples(self):
+        with self._cond:
+            return sum(len(c) for c, _ in self._items)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "policy": self.policy,
+                "depth": len(self._items),
+                "put": self.put_count,
+                "coalesced": self.coalesced_count,
+                "dropped_chunks": self.dropped_chunks,
+                "dropped_samples": self.dropped_samples,
+            }
@@ -0,0 +1,102 @@
+"""
+Background refinement of live captions with a larger model.
+
+In dual mode the live pipeline runs a small model for instant captions and
+hands every final line to LiveRefiner. The refiner keeps the last
+`history` seconds of session audio (fed from the capture thread) and, while
+the live path is idle, re-transcribes each line's [start, end) span with
+the larger model. Improved text is reported through
+`on_refined(key, segment, text)`, which updates the transcript box and
+the stored segment.
+
+Lines whose audio has already left the history are skipped; their fast
+caption stays. After the session stops, close() lets the worker drain the
+backlog.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+from .ring_buffer import AudioRingBuffer
+
+SAMPLE_RATE = 16000
+REFINE_HISTORY = 300.0  # Seconds of session audio kept for refinement
+REFINE_PADDING = 0.3    # Extra audio on each side of a line
+IDLE_POLL = 0.5         # Seconds between checks while the live path is busy
+
+
+class LiveRefiner:
+    def __init__(self, model_loader, on_refined, language="es", is_busy=None, history=REFINE_HISTORY,
+                 beam_size=5):
+        self.model_loader = model_loader  # Called on the worker thread, so loading never blocks capture
+        self.on_refined = on_refined
+        self.language = language
+        self.is_busy = is_busy or (lambda: False)
+        self.beam_size = beam_size
+        self.ring = AudioRingBuffer(int(SAMPLE_RATE * history))
+        self.pending = deque()
+        self.refined = 0
+        self.skipped = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def feed(self, audio):
+        """Capture thread: append 16 kHz session audio."""
+        with self._cond:
+            self.ring.write(audio)
+
+    def submit(self, key, segment):
+        with self._cond:
+            self.pending.append((key, segment))
+            self._cond.notify()
+
+    def close(self):
+        """Stop accepting lines; the worker refines what is still pending, then exits."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _audio(self, segment):
+        with self._cond:
+            view = self.ring.span((segment.start - REFINE_PADDING) * SAMPLE_RATE,
+                                  (segment.end + REFINE_PADDING) * SAMPLE_RATE)
+            return None if view is None else view.copy()
+
+    def _next(self):
+        with self._cond:
+            while not self.pending and not self._closed:
+                self._cond.wait()
+            return self.pending.popleft() if self.pending else None
+
+    def _worker(self):
+        model = None
+        while True:
+            item = self._next()
+            if item is None:
+                break
+            while not self._closed and self.is_busy():
+                time.sleep(IDLE_POLL)
+            key, segment = item
+            audio = self._audio(segment)
+            if audio is None:
+                self.skipped += 1
+                continue
+            try:
+                model = model or self.model_loader()
+                segments, _ = model.transcribe(audio, language=self.language, beam_size=self.beam_size,
+                                               vad_filter=True, condition_on_previous_text=False)
+                text = " ".join(s.text.strip() for s in segments).strip()
+            except Exception as e:
+                self.logger.error(f"Refinement failed: {e}")
+                continue
+            if text and text != segment.text:
+                self.refined += 1
+                self.on_refined(key, segment, text)
+        self.logger.info(f"Refiner finished: {self.refined} lines refined, {self.skipped} skipped")
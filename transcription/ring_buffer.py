@@ -0,0 +1,112 @@
+"""
+Fixed-capacity float32 ring buffer for the live audio path.
+
+Every sample is stored twice (at ``i`` and ``i + capacity``), so any window of
+up to ``capacity`` samples is a contiguous slice of the backing array. That
+lets ``latest()`` and ``next_chunk()`` hand out zero-copy views while
+``write()`` never allocates.
+"""
+import numpy as np
+
+
+class AudioRingBuffer:
+    def __init__(self, capacity, buffer=None):
+        self.capacity = int(capacity)
+        # `buffer` (2 * capacity float32, e.g. backed by shared memory) replaces the private array
+        self._data = np.zeros(self.capacity * 2, dtype=np.float32) if buffer is None else buffer
+        self._write_pos = 0    # Absolute number of samples ever written
+        self._read_pos = 0     # Absolute start of the next chunk
+        self.overflow_samples = 0  # Unread samples overwritten before being consumed
+
+    def __len__(self):
+        return min(self._write_pos, self.capacity)
+
+    @property
+    def written(self):
+        """Absolute number of samples ever written."""
+        return self._write_pos
+
+    @property
+    def available(self):
+        """Samples written but not yet consumed by next_chunk()."""
+        return self._write_pos - self._read_pos
+
+    def write(self, samples):
+        """Copy samples into the buffer (two in-place copies, no allocation)."""
+        n = len(samples)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Only the newest `capacity` samples can survive anyway
+            self._write_pos += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        start = self._write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[start + self.capacity:start + self.capacity + first] = samples[:first]
+        if first < n:
+            rest = n - first
+            self._data[:rest] = samples[first:]
+            self._data[self.capacity:self.capacity + rest] = samples[first:]
+        self._write_pos += n
+
+        lost = self._write_pos - self._read_pos - self.capacity
+        if lost > 0:
+            self.overflow_samples += lost
+            self._read_pos += lost
+
+    def _view(self, abs_start, n):
+        start = abs_start % self.capacity
+        return self._data[start:start + n]
+
+    def latest(self, n):
+        """Zero-copy view of the last `n` samples (fewer if not yet written)."""
+        n = min(int(n), len(self))
+        return self._view(self._write_pos - n, n)
+
+    def span(self, abs_start, abs_end):
+        """Zero-copy view of absolute samples [abs_start, abs_end), or None if already overwritten."""
+        abs_end = min(int(abs_end), self._write_pos)
+        abs_start = max(0, int(abs_start))
+        if abs_start < self._write_pos - len(self) or abs_start >= abs_end:
+            return None
+        return self._view(abs_start, abs_end - abs_start)
+
+    def next_chunk(self, chunk_size, overlap=0):
+        """
+        Zero-copy view of the next `chunk_size` unread samples, or None.
+        The read position advances by `chunk_size - overlap`, so consecutive
+        chunks share `overlap` samples. The view is only valid until the next
+        write() wraps over it; copy it if it must outlive that.
+        """
+        if chunk_size > self.capacity or self.available < chunk_size:
+            return None
+        view = self._view(self._read_pos, chunk_size)
+        self._read_pos += chunk_size - overlap
+        return view
+
+    def clear(self):
+        self._read_pos = self._write_pos = 0
+        self.overflow_samples = 0
+
+
+def pcm16_to_float(data, channels, out):
+    """
+    Convert interleaved int16 PCM bytes to mono float32 in a preallocated
+    buffer of at least ``frames * (channels + 1)`` samples. Returns a view of
+    `out` holding the converted frames.
+    """
+    pcm = np.frombuffer(data, dtype=np.int16)
+    frames = len(pcm) // channels
+    if channels == 1:
+        mono = out[:frames]
+        np.multiply(pcm, 1.0 / 32768.0, out=mono, casting="unsafe")
+        return mono
+    # Scale the interleaved block in place, then average channels into the head of `out`
+    scaled = out[frames:frames + len(pcm)]
+    np.multiply(pcm, 1.0 / (32768.0 * channels), out=scaled, casting="unsafe")
+    mono = out[:frames]
+    np.sum(scaled.reshape(frames, channels), axis=1, out=mono)
+    return mono
@@ -0,0 +1,76 @@
+"""
+Keeps live inference real-time by adapting chunk length and beam size.
+
+Real-time factor (RTF) = inference seconds / audio seconds. Above 1.0 the
+backlog grows without bound. Whisper pads every call to a 30 s window, so a
+longer chunk costs little more than a short one; that makes chunk length the
+main lever, with beam size as the cheaper first step.
+
+- RTF (smoothed) above `high`: drop beam size, then lengthen chunks.
+- RTF below `low`: restore beam size, then shorten chunks (lower latency).
+"""
+BEAM_STEPS = (5, 3, 2, 1)
+
+
+class RealtimeController:
+    def __init__(self, chunk_duration=3.0, min_chunk=2.0, max_chunk=8.0, chunk_step=1.0,
+                 beam_size=5, low=0.5, high=0.85, smoothing=0.3, cooldown=2):
+        self.chunk_duration = chunk_duration
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.chunk_step = chunk_step
+        self.beam_size = beam_size
+        self.low = low
+        self.high = high
+        self.smoothing = smoothing
+        self.cooldown = cooldown  # Observations to wait after each adjustment
+        self.rtf = None
+        self.last_rtf = None
+        self._since_change = 0
+
+    def observe(self, audio_seconds, inference_seconds):
+        """Record one inference call; returns True if settings changed."""
+        if audio_seconds <= 0:
+            return False
+        self.last_rtf = inference_seconds / audio_seconds
+        if self.rtf is None:
+            self.rtf = self.last_rtf
+        else:
+            self.rtf += self.smoothing * (self.last_rtf - self.rtf)
+        self._since_change += 1
+        if self._since_change < self.cooldown:
+            return False
+
+        changed = False
+        if self.rtf > self.high:
+            changed = self._lower_beam() or self._change_chunk(+self.chunk_step)
+        elif self.rtf < self.low:
+            changed = self._raise_beam() or self._change_chunk(-self.chunk_step)
+        if changed:
+            self._since_change = 0
+        return changed
+
+    def _lower_beam(self):
+        smaller = [b for b in BEAM_STEPS if b < self.beam_size]
+        if not smaller:
+            return False
+        self.beam_size = smaller[0]
+        return True
+
+    def _raise_beam(self):
+        larger = [b for b in BEAM_STEPS if b > self.beam_size]
+        if not larger:
+            return False
+        self.beam_size = larger[-1]
+        return True
+
+    def _change_chunk(self, delta):
+        new = min(self.max_chunk, max(self.min_chunk, self.chunk_duration + delta))
+        if new == self.chunk_duration:
+            return False
+        self.chunk_duration = new
+        return True
+
+    def describe(self):
+        rtf = f"{self.rtf:.2f}" if self.rtf is not None else "–"
+        return f"RTF {rtf} · {self.chunk_duration:.1f}s · beam {self.beam_size}"
@@ -0,0 +1,20 @@
+"""
+Timestamped transcript segments shared by the live and file paths.
+
+`start`/`end` are seconds from the beginning of the recording (file time
+for uploads, captured-audio time for live sessions). `avg_logprob` is
+Whisper's mean token log-probability, None when unknown; `words` is an
+optional list of (start, end, word) tuples.
+"""
+from collections import namedtuple
+
+Segment = namedtuple("Segment", "start end text avg_logprob words", defaults=(None, None))
+
+
+def from_whisper(segment, offset=0.0):
+    """Segment from a faster-whisper segment, shifted by `offset` seconds."""
+    words = None
+    if segment.words:
+        words = [(offset + w.start, offset + w.end, w.word) for w in segment.words]
+    return Segment(offset + segment.start, offset + segment.end, segment.text.strip(),
+                   segment.avg_logprob, words)
@@ -0,0 +1,264 @@
+"""
+Audio sources for the live pipeline.
+
+Every source delivers interleaved int16 PCM bytes at its own native rate and
+channel count, exactly like a pyaudio stream, so the capture loop doesn't
+care whether audio comes from WASAPI, a file on disk or a generator:
+
+    source.open(buffer_duration)   # sets sample_rate / channels
+    data = source.read(frames)     # b"" once the source is exhausted
+    source.close()
+
+- WasapiSource: system loopback or default microphone (Windows only)
+- FileSource: WAV/FLAC replay at 1x (like a live device) or as fast as possible
+- SyntheticSource: tone / noise / speech-like bursts, for headless profiling
+"""
+import os
+import threading
+import time
+import wave
+
+import numpy as np
+
+try:
+    import pyaudiowpatch as pyaudio
+    WASAPI_AVAILABLE = True
+except ImportError:
+    WASAPI_AVAILABLE = False
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+
+class AudioSource:
+    """Base class: subclasses set sample_rate/channels in open() and implement read()."""
+    name = "audio"
+    sample_rate = 16000
+    channels = 1
+    overflows = 0  # Times the device (or source backlog) had already discarded audio
+
+    def open(self, buffer_duration):
+        pass
+
+    def read(self, frames):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class _Pacer:
+    """Sleeps so that delivered frames never run ahead of the wall clock."""
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.start = None
+        self.frames = 0
+
+    def wait(self, frames):
+        if self.start is None:
+            self.start = time.perf_counter()
+        self.frames += frames
+        delay = self.start + self.frames / self.sample_rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+WASAPI_BACKLOG_DURATION = 10.0  # Seconds of captured audio held for a reader that fell behind
+WASAPI_READ_TIMEOUT = 1.0       # Seconds between checks that the stream is still delivering
+
+
+class WasapiSource(AudioSource):
+    """
+    Default speakers (via loopback) or default microphone through pyaudiowpatch.
+
+    The stream runs in callback mode: PortAudio hands every buffer to
+    _on_audio, which appends it to a backlog that read() drains. Overflows
+    are counted from the callback's paInputOverflow status flag, so no
+    captured audio is discarded to detect them (a blocking read with
+    exception_on_overflow=True throws away the buffer it had filled).
+    """
+    def __init__(self, use_microphone=False):
+        if not WASAPI_AVAILABLE:
+            raise RuntimeError("pyaudiowpatch no está instalado (captura WASAPI solo en Windows)")
+        self.use_microphone = use_microphone
+        self._pa = None
+        self._stream = None
+        self._backlog = bytearray()
+        self._max_backlog = 0
+        self._cond = threading.Condition()
+
+    def open(self, buffer_duration):
+        self._pa = pyaudio.PyAudio()
+        wasapi = self._pa.get_host_api_info_by_type(pyaudio.paWASAPI)
+        if self.use_microphone:
+            device = self._pa.get_device_info_by_index(wasapi["defaultInputDevice"])
+        else:
+            speakers = self._pa.get_device_info_by_index(wasapi["defaultOutputDevice"])
+            device = speakers
+            if not speakers.get("isLoopbackDevice"):
+                for lb in self._pa.get_loopback_device_info_generator():
+                    if speakers["name"] in lb["name"]:
+                        device = lb
+                        break
+        self.name = device["name"]
+        self.sample_rate = int(device["defaultSampleRate"])
+        self.channels = device["maxInputChannels"]
+        self._backlog.clear()
+        self._max_backlog = int(WASAPI_BACKLOG_DURATION * self.sample_rate) * 2 * self.channels
+        self._stream = self._pa.open(format=pyaudio.paInt16, channels=self.channels, rate=self.sample_rate,
+                                     frames_per_buffer=int(self.sample_rate * buffer_duration), input=True,
+                                     input_device_index=device["index"], stream_callback=self._on_audio)
+
+    def _on_audio(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio thread: keep every captured buffer; count the ones the device reports as overflowed."""
+        with self._cond:
+            if status_flags & pyaudio.paInputOverflow:
+                self.overflows += 1
+            self._backlog.extend(in_data)
+            excess = len(self._backlog) - self._max_backlog
+            if excess > 0:  # Reader stalled for longer than the backlog: drop the oldest audio
+                del self._backlog[:excess]
+                self.overflows += 1
+            self._cond.notify()
+        return None, pyaudio.paContinue
+
+    def read(self, frames):
+        nbytes = frames * 2 * self.channels
+        with self._cond:
+            while len(self._backlog) < nbytes:
+                if self._stream is None or not self._stream.is_active():
+                    nbytes = len(self._backlog) - len(self._backlog) % (2 * self.channels)
+                    break
+                self._cond.wait(WASAPI_READ_TIMEOUT)
+            data = bytes(self._backlog[:nbytes])
+            del self._backlog[:nbytes]
+        return data
+
+    def close(self):
+        with self._cond:
+            stream, self._stream = self._stream, None
+            self._cond.notify_all()  # A pending read() returns what is buffered
+        if stream is not None:
+            stream.stop_stream()
+            stream.close()
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+
+class FileSource(AudioSource):
+    """Replay a WAV (stdlib) or FLAC/OGG (soundfile) file as if it were a device."""
+    def __init__(self, path, realtime=True):
+        self.path = path
+        self.realtime = realtime
+        self.name = os.path.basename(path)
+        self._wav = None
+        self._sf = None
+        self._pacer = None
+
+    def open(self, buffer_duration):
+        if self.path.lower().endswith(".wav") and not SOUNDFILE_AVAILABLE:
+            self._wav = wave.open(self.path, "rb")
+            if self._wav.getsampwidth() != 2:
+                raise ValueError("Solo se admiten WAV PCM de 16 bits sin soundfile")
+            self.sample_rate = self._wav.getframerate()
+            self.channels = self._wav.getnchannels()
+        elif SOUNDFILE_AVAILABLE:
+            self._sf = soundfile.SoundFile(self.path)
+            self.sample_rate = self._sf.samplerate
+            self.channels = self._sf.channels
+        else:
+            raise RuntimeError("Instala soundfile para reproducir archivos que no sean WAV")
+        self._pacer = _Pacer(self.sample_rate) if self.realtime else None
+
+    def read(self, frames):
+        if self._wav is not None:
+            data = self._wav.readframes(frames)
+        else:
+            data = self._sf.read(frames, dtype="int16").tobytes()
+        if data and self._pacer:
+            self._pacer.wait(len(data) // (2 * self.channels))
+        return data
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        if self._sf is not None:
+            self._sf.close()
+            self._sf = None
+
+
+class SyntheticSource(AudioSource):
+    """
+    Generated signal: "tone", "noise", or "bursts" (tone bursts separated by
+    silence, roughly the on/off pattern of a lecture). `duration=None` runs
+    until closed.
+    """
+    def __init__(self, kind="bursts", sample_rate=48000, channels=2, duration=None, realtime=True,
+                 frequency=220.0, amplitude=0.3, burst_duration=2.0, silence_duration=6.0, seed=0):
+        self.kind = kind
+        self.name = f"synthetic:{kind}"
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.duration = duration
+        self.realtime = realtime
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.burst_duration = burst_duration
+        self.silence_duration = silence_duration
+        self._rng = np.random.default_rng(seed)
+        self._pos = 0
+        self._pacer = None
+
+    def open(self, buffer_duration):
+        self._pos = 0
+        self._pacer = _Pacer(self.sample_rate) if self.realtime else None
+
+    def read(self, frames):
+        if self.duration is not None:
+            frames = min(frames, int(self.duration * self.sample_rate) - self._pos)
+            if frames <= 0:
+                return b""
+        t = (self._pos + np.arange(frames)) / self.sample_rate
+        if self.kind == "noise":
+            signal = self._rng.standard_normal(frames) * self.amplitude / 3
+        else:
+            # Phase is a function of absolute time, so blocks join seamlessly
+            signal = self.amplitude * np.sin(2 * np.pi * self.frequency * t)
+            if self.kind == "bursts":
+                period = self.burst_duration + self.silence_duration
+                signal *= (t % period) < self.burst_duration
+        self._pos += frames
+        pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+        if self._pacer:
+            self._pacer.wait(frames)
+        return np.repeat(pcm[:, None], self.channels, axis=1).tobytes()
+
+
+def create_source(spec="wasapi", use_microphone=False):
+    """
+    Build a source from a short spec string (also used by the AUDIO_SOURCE
+    environment variable): "wasapi", "file:<path>", "file-fast:<path>",
+    "synthetic" or "synthetic:<kind>".
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "wasapi":
+        return WasapiSource(use_microphone)
+    if kind == "file":
+        return FileSource(arg, realtime=True)
+    if kind == "file-fast":
+        return FileSource(arg, realtime=False)
+    if kind == "synthetic":
+        return SyntheticSource(arg or "bursts")
+    raise ValueError(f"Fuente de audio desconocida: {spec}")
@@ -0,0 +1,118 @@
+"""
+Bounded-memory decoding of long uploads with PyAV.
+
+faster-whisper's decode_audio() turns a whole file into one float32 array
+(~700 MB for a 3 h video) before inference starts. iter_windows() instead
+decodes and resamples packet by packet into a preallocated window buffer
+and yields ~`window` seconds at a time, cut at the quietest 100 ms near the
+end of each window so no word is split. Peak memory is one window (19 MB
+for 5 min) plus the model, however long the file.
+
+A start offset is honoured by seeking in the container, so resuming an
+interrupted job doesn't decode the part that is already done. Times are
+seconds from the stream's first sample (its start_time, which is not 0 in
+e.g. MPEG-TS), and windows start where the decoded audio actually is, even
+if the seek lands past the offset. A stream without frame timestamps can't
+tell where a seek landed, so it is decoded from the start instead.
+"""
+import numpy as np
+
+SAMPLE_RATE = 16000
+WINDOW_DURATION = 300.0  # Seconds per transcribe() call
+CUT_SEARCH_DURATION = 5.0  # Look for a quiet cut point in the last seconds of each window
+CUT_FRAME_DURATION = 0.1
+
+
+def probe_duration(filepath):
+    """Container duration in seconds (0.0 if the file doesn't say)."""
+    import av
+    with av.open(filepath, metadata_errors="ignore") as container:
+        if container.duration:
+            return container.duration / av.time_base
+        stream = container.streams.audio[0]
+        if stream.duration and stream.time_base:
+            return float(stream.duration * stream.time_base)
+    return 0.0
+
+
+def quiet_cut(audio, search, frame):
+    """Index in the last `search` samples of `audio` at the middle of its quietest `frame`-sample block."""
+    base = max(0, len(audio) - search)
+    tail = audio[base:]
+    n = len(tail) // frame
+    if n < 2:
+        return len(audio)
+    energy = np.square(tail[:n * frame].reshape(n, frame)).mean(axis=1)
+    return base + int(np.argmin(energy)) * frame + frame // 2
+
+
+def _decoded_frames(filepath, sample_rate, start_offset):
+    """(start_seconds, mono float32 block) for every resampled frame from about start_offset on."""
+    import av
+    restart = False
+    with av.open(filepath, metadata_errors="ignore") as container:
+        stream = container.streams.audio[0]
+        origin = 0.0
+        if stream.start_time is not None and stream.time_base:
+            origin = float(stream.start_time * stream.time_base)
+        if start_offset > 0:
+            # Usually lands on an earlier keyframe, but may land later
+            container.seek(int((origin + start_offset) * av.time_base), any_frame=False)
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+        position = None
+        for frame in container.decode(stream):
+            if position is None:
+                if frame.time is not None:
+                    position = frame.time - origin
+                elif start_offset > 0:
+                    restart = True  # Unknown landing point after the seek
+                    break
+                else:
+                    position = 0.0  # No seek: decoding starts at the stream's first sample
+            for out in resampler.resample(frame):
+                block = out.to_ndarray().reshape(-1).astype(np.float32) / 32768.0
+                yield position, block
+                position += len(block) / sample_rate
+        if not restart:
+            for out in resampler.resample(None):  # Flush the resampler's tail
+                block = out.to_ndarray().reshape(-1).astype(np.float32) / 32768.0
+                yield position or 0.0, block
+                position = (position or 0.0) + len(block) / sample_rate
+    if restart:
+        # Decode from the start and count samples; iter_windows drops everything before the offset
+        yield from _decoded_frames(filepath, sample_rate, 0.0)
+
+
+def iter_windows(filepath, window=WINDOW_DURATION, sample_rate=SAMPLE_RATE, start_offset=0.0):
+    """
+    Yield (start_seconds, float32 array) windows covering the file from `start_offset`.
+    Each array is a fresh copy; the internal buffer is reused.
+    """
+    window_samples = int(window * sample_rate)
+    search = int(CUT_SEARCH_DURATION * sample_rate)
+    frame = int(CUT_FRAME_DURATION * sample_rate)
+    buf = np.empty(window_samples * 2, dtype=np.float32)  # Room for one window plus a decoded block
+    filled = 0
+    buf_start = None  # File time of buf[0], from the first block actually kept
+
+    for position, block in _decoded_frames(filepath, sample_rate, start_offset):
+        skip = int(round((start_offset - position) * sample_rate))
+        if skip >= len(block):
+            continue  # Still before the offset after seeking to a keyframe
+        if skip > 0:
+            block = block[skip:]
+        if buf_start is None:
+            # Not start_offset: the seek may have landed later, or the stream starts later
+            buf_start = position + max(skip, 0) / sample_rate
+        if filled + len(block) > len(buf):
+            buf = np.concatenate([buf[:filled], np.empty(len(block) + window_samples, dtype=np.float32)])
+        buf[filled:filled + len(block)] = block
+        filled += len(block)
+        while filled >= window_samples:
+            cut = quiet_cut(buf[:window_samples], search, frame)
+            yield buf_start, buf[:cut].copy()
+            buf[:filled - cut] = buf[cut:filled]
+            filled -= cut
+            buf_start += cut / sample_rate
+    if filled:
+        yield buf_start, buf[:filled].copy()
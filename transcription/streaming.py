@@ -0,0 +1,145 @@
+"""
+Streaming decoder with LocalAgreement-2 commit policy on top of faster-whisper.
+
+Instead of decoding independent 3 s windows, audio is appended to a growing
+buffer that is re-decoded every step (~1 s) with word timestamps. A word is
+committed only once two consecutive hypotheses agree on it (the longest
+common prefix), so boundary words are neither repeated nor cut. Committed
+text is fed back as `initial_prompt`, and the buffer is trimmed behind the
+last committed word so each step only re-decodes the uncommitted tail.
+"""
+import re
+
+import numpy as np
+
+_NORMALIZE = re.compile(r"[^\w']+")
+
+
+def _norm(word):
+    return _NORMALIZE.sub("", word.lower())
+
+
+class HypothesisBuffer:
+    """Tracks the previous hypothesis and commits what the new one agrees on."""
+    def __init__(self):
+        self.committed = []     # (start, end, word) committed so far (absolute seconds)
+        self.previous = []      # Last uncommitted hypothesis
+        self.current = []
+        self.last_commit_end = 0.0
+
+    def insert(self, words):
+        # Drop words that end before what was already committed (re-decoded context)
+        new = [w for w in words if w[1] > self.last_commit_end + 0.05]
+        # Whisper often re-emits the last committed words at the start of the
+        # buffer; strip the longest such n-gram (up to 5 words)
+        if new and self.committed:
+            for n in range(min(5, len(self.committed), len(new)), 0, -1):
+                tail = [_norm(w[2]) for w in self.committed[-n:]]
+                head = [_norm(w[2]) for w in new[:n]]
+                if tail == head:
+                    new = new[n:]
+                    break
+        self.current = new
+
+    def flush(self):
+        """Commit the longest common prefix of the previous and current hypotheses."""
+        agreed = []
+        for prev, cur in zip(self.previous, self.current):
+            if _norm(prev[2]) != _norm(cur[2]):
+                break
+            agreed.append(cur)
+        self.previous = self.current[len(agreed):]
+        if agreed:
+            self.committed.extend(agreed)
+            self.last_commit_end = agreed[-1][1]
+        return agreed
+
+    def tentative(self):
+        return self.previous
+
+    def complete(self):
+        """Commit whatever is left (end of utterance / end of stream)."""
+        rest = self.previous
+        self.previous = []
+        if rest:
+            self.committed.extend(rest)
+            self.last_commit_end = rest[-1][1]
+        return rest
+
+
+class StreamingDecoder:
+    def __init__(self, model, language="es", sample_rate=16000, beam_size=5,
+                 max_buffer=15.0, prompt_chars=200):
+        self.model = model
+        self.language = language
+        self.sample_rate = sample_rate
+        self.beam_size = beam_size
+        self.max_buffer = max_buffer
+        self.prompt_chars = prompt_chars
+        self.reset()
+
+    def reset(self):
+        self.audio = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0  # Absolute time (s) of audio[0]
+        self.hypothesis = HypothesisBuffer()
+
+    @property
+    def stream_time(self):
+        return self.buffer_offset + len(self.audio) / self.sample_rate
+
+    def insert_audio(self, chunk):
+        self.audio = np.concatenate([self.audio, chunk])
+
+    def _prompt(self):
+        text = " ".join(w[2].strip() for w in self.hypothesis.committed)
+        return text[-self.prompt_chars:] if text else None
+
+    def process(self):
+        """Re-decode the buffer; returns (newly committed words, tentative words)."""
+        if not len(self.audio):
+            return [], []
+        segments, _ = self.model.transcribe(
+            self.audio, language=self.language, beam_size=self.beam_size,
+            initial_prompt=self._prompt(), word_timestamps=True, condition_on_previous_text=False,
+            vad_filter=True, vad_parameters=dict(min_silence_duration_ms=500))
+        words = []
+        for segment in segments:
+            for w in segment.words or ():
+                words.append((self.buffer_offset + w.start, self.buffer_offset + w.end, w.word))
+        self.hypothesis.insert(words)
+        committed = self.hypothesis.flush()
+        committed += self._trim()
+        return committed, self.hypothesis.tentative()
+
+    def _trim(self):
+        """Drop audio behind the last committed word once the buffer gets long."""
+        if len(self.audio) / self.sample_rate <= self.max_buffer:
+            return []
+        forced = []
+        cut = self.hypothesis.last_commit_end - self.buffer_offset
+        if cut <= 0:
+            # Nothing committed inside the window (e.g. unbroken noise): hard-trim
+            # to keep decoding cost bounded and commit what we have
+            forced = self.hypothesis.complete()
+            cut = len(self.audio) / self.sample_rate - self.max_buffer / 2
+        samples = int(cut * self.sample_rate)
+        self.audio = self.audio[samples:]
+        self.buffer_offset += samples / self.sample_rate
+        return forced
+
+    def end_utterance(self, gap_seconds=0.0):
+        """Silence or end of stream: commit the tail and start a fresh buffer."""
+        rest = self.hypothesis.complete()
+        committed = self.hypothesis.committed
+        offset = self.stream_time + gap_seconds
+        self.audio = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = offset
+        self.hypothesis = HypothesisBuffer()
+        # Keep the prompt context across utterances
+        self.hypothesis.committed = committed[-50:]
+        self.hypothesis.last_commit_end = offset
+        return rest
+
+
+def words_to_text(words):
+    return "".join(w[2] for w in words).strip()
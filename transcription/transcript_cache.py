@@ -0,0 +1,50 @@
+"""
+Content-addressed cache of file transcriptions.
+
+The key is a BLAKE2b digest of the file's bytes (read in 1 MB blocks, so
+multi-GB videos never sit in memory) combined with everything that changes
+Whisper's output: model size, compute type, language and decode options.
+Renaming or moving a recording still hits; re-encoding it doesn't.
+
+Entries live in their own LRUStore file (data/transcript_cache.db) because
+they are disposable.
+"""
+import hashlib
+import json
+import os
+
+from utils.lru_store import LRUStore
+from .segments import Segment
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "transcript_cache.db")
+CACHE_MAX_MB = 200
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(filepath, block_size=HASH_BLOCK_SIZE):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(digest, size, compute_type, language, **options):
+    params = json.dumps({"model": size, "compute_type": compute_type, "language": language, **options},
+                        sort_keys=True)
+    return hashlib.blake2b(f"{digest}|{params}".encode(), digest_size=20).hexdigest()
+
+
+class TranscriptCache(LRUStore):
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_MB * 2**20):
+        super().__init__(path, max_bytes, label="transcript")
+
+    def get(self, key):
+        """(duration, [Segment]) for a cached transcription, or None."""
+        entry = super().get(key)
+        if entry is None:
+            return None
+        return entry["duration"], [Segment(*s) for s in entry["segments"]]
+
+    def put(self, key, duration, segments):
+        super().put(key, {"duration": duration, "segments": [list(s) for s in segments]})
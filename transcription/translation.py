@@ -0,0 +1,202 @@
+"""
+Asynchronous translation of final transcript lines.
+
+Translating inline (argostranslate takes 100-500 ms per sentence on CPU)
+would hold up the UI queue and with it the original captions. The UI
+thread only calls TranslationWorker.submit(), which never blocks; a worker
+thread collects lines for up to `batch_window` seconds (or `batch_size`
+lines), translates them and reports each result through
+`on_translated(key, text)` in submission order.
+
+Lines are split into sentences and every sentence goes through an LRU
+cache first: lectures repeat the same phrases ("¿alguna pregunta?",
+"next slide"), and those are returned without touching the model. The
+remaining sentences of a batch are translated in one call, joined as
+paragraphs, so the translator runs one batched decode instead of one per
+sentence.
+
+The argostranslate helpers never touch the network unless asked to:
+startup only checks the locally installed packages
+(`installed_package`), the model behind ArgosTranslator is loaded on its
+first sentence, and `install_package` (index refresh + download) runs only
+when the user enables translation without the package installed.
+"""
+import importlib.util
+import logging
+import re
+import threading
+from collections import OrderedDict, deque
+
+# argostranslate is imported on first use: importing it pulls in its NLP stack, which would add to launch time
+TRANSLATION_AVAILABLE = importlib.util.find_spec("argostranslate") is not None
+
+TRANSLATION_CACHE_SIZE = 2000  # Sentences kept in the LRU cache
+TRANSLATION_BATCH_SIZE = 8     # Lines translated per call at most
+TRANSLATION_BATCH_WINDOW = 0.5 # Seconds to wait for more lines before translating a batch
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?…])\s+")
+
+
+def split_sentences(text):
+    return [s for s in _SENTENCE_SPLIT.split(text.strip()) if s]
+
+
+class SentenceCache:
+    """Sentence -> translation with least-recently-used eviction."""
+
+    def __init__(self, max_entries=TRANSLATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sentence):
+        translated = self._entries.get(sentence)
+        if translated is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(sentence)
+        self.hits += 1
+        return translated
+
+    def put(self, sentence, translated):
+        self._entries[sentence] = translated
+        self._entries.move_to_end(sentence)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def installed_package(from_code="en", to_code="es"):
+    """The locally installed argostranslate package for the pair, or None (offline check)."""
+    import argostranslate.package
+    return next((p for p in argostranslate.package.get_installed_packages()
+                 if p.from_code == from_code and p.to_code == to_code), None)
+
+
+def install_package(from_code="en", to_code="es"):
+    """Refresh the package index and install the pair. Network access; returns False if it isn't offered."""
+    import argostranslate.package
+    argostranslate.package.update_package_index()
+    pkg = next((p for p in argostranslate.package.get_available_packages()
+                if p.from_code == from_code and p.to_code == to_code), None)
+    if pkg is None:
+        return False
+    argostranslate.package.install_from_path(pkg.download())
+    return True
+
+
+class ArgosTranslator:
+    """
+    Callable translator for an installed pair. The translation model is
+    resolved once, on the first call (from the translation worker thread),
+    instead of on every argostranslate.translate.translate() call.
+    """
+
+    def __init__(self, from_code="en", to_code="es"):
+        self.from_code = from_code
+        self.to_code = to_code
+        self._translation = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        import argostranslate.translate
+        languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+        if self.from_code not in languages or self.to_code not in languages:
+            raise RuntimeError(f"Paquete de traducción {self.from_code}→{self.to_code} no instalado")
+        return languages[self.from_code].get_translation(languages[self.to_code])
+
+    def __call__(self, text):
+        with self._lock:
+            if self._translation is None:
+                self._translation = self._load()
+        return self._translation.translate(text)
+
+
+def translate_batch(translate_func, sentences):
+    """
+    Translate several sentences with one call by joining them as paragraphs.
+    Falls back to one call per sentence if the translator doesn't keep the
+    paragraph count.
+    """
+    if len(sentences) == 1:
+        return [translate_func(sentences[0]).strip()]
+    joined = translate_func("\n".join(sentences))
+    parts = [p.strip() for p in joined.split("\n")]
+    if len(parts) == len(sentences):
+        return parts
+    return [translate_func(s).strip() for s in sentences]
+
+
+class TranslationWorker:
+    def __init__(self, translate_func, on_translated, cache_size=TRANSLATION_CACHE_SIZE,
+                 batch_size=TRANSLATION_BATCH_SIZE, batch_window=TRANSLATION_BATCH_WINDOW):
+        self.translate_func = translate_func  # May be replaced later (translator loaded lazily)
+        self.on_translated = on_translated
+        self.cache = SentenceCache(cache_size)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.pending = deque()
+        self.translated = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, key, text):
+        """Any thread: queue one final line; never blocks on translation."""
+        with self._cond:
+            self.pending.append((key, text))
+            self._cond.notify()
+
+    def close(self):
+        """Stop accepting lines; the worker translates what is still pending, then exits."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self.pending and not self._closed:
+                self._cond.wait()
+            if not self.pending:
+                return None
+            # Give the following lines a moment to arrive so they share one translator call
+            self._cond.wait_for(lambda: len(self.pending) >= self.batch_size or self._closed, self.batch_window)
+            return [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+
+    def _translate_lines(self, lines):
+        sentences = [split_sentences(text) for _, text in lines]
+        known = {}
+        for sentence in dict.fromkeys(s for line in sentences for s in line):
+            translated = self.cache.get(sentence)
+            if translated is not None:
+                known[sentence] = translated
+        missing = list(dict.fromkeys(s for line in sentences for s in line if s not in known))
+        if missing:
+            for sentence, translated in zip(missing, translate_batch(self.translate_func, missing)):
+                self.cache.put(sentence, translated)
+                known[sentence] = translated
+        return [(key, " ".join(known[s] for s in line)) for (key, _), line in zip(lines, sentences)]
+
+    def _worker(self):
+        while True:
+            lines = self._next_batch()
+            if lines is None:
+                break
+            try:
+                results = self._translate_lines(lines)
+            except Exception as e:
+                self.logger.error(f"Translation failed: {e}")
+                continue
+            for key, text in results:
+                self.translated += 1
+                self.on_translated(key, text)
+        self.logger.info(f"Translator finished: {self.translated} lines, cache {self.cache.hits} hits / "
+                         f"{self.cache.misses} misses")
@@ -0,0 +1,68 @@
+"""
+Cheap energy / zero-crossing gate run in the capture stage.
+
+Silero VAD inside WhisperModel.transcribe() only runs after we've already
+paid for a model call. This gate looks at 30 ms frames of each chunk with a
+couple of vectorized numpy reductions and lets silent chunks skip inference
+entirely. Hysteresis (separate open/close thresholds plus a hangover measured in
+audio time, so it holds as long with 0.25 s blocks as with 3 s chunks)
+keeps it from chattering on quiet speech or cutting word tails.
+"""
+import logging
+
+import numpy as np
+
+
+class EnergyGate:
+    def __init__(self, sample_rate=16000, frame_ms=30, open_db=-45.0, close_db=-52.0,
+                 max_zcr=0.35, min_speech_ms=150, hangover_ms=500):
+        self.frame = int(sample_rate * frame_ms / 1000)
+        self.open_db = open_db
+        self.close_db = close_db
+        self.max_zcr = max_zcr
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.hangover_samples = int(sample_rate * hangover_ms / 1000)
+        self.logger = logging.getLogger(__name__)
+
+        self.is_open = False
+        self._hangover = 0  # Samples the gate stays open after the last speech
+        self.checked = 0
+        self.skipped = 0
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.checked if self.checked else 0.0
+
+    def speech_frames(self, chunk):
+        """Number of frames that look like speech at the current threshold."""
+        n = len(chunk) // self.frame
+        if n == 0:
+            return 0
+        frames = chunk[:n * self.frame].reshape(n, self.frame)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame - 1)
+
+        threshold = self.close_db if self.is_open else self.open_db
+        # Loud frames always count (fricatives have a high ZCR); quieter ones must
+        # also look voiced, which rejects broadband hiss and fan noise
+        voiced = (energy_db > threshold) & ((zcr < self.max_zcr) | (energy_db > threshold + 10.0))
+        return int(np.count_nonzero(voiced))
+
+    def accept(self, chunk):
+        """True if the chunk should be transcribed, False if it can be skipped."""
+        self.checked += 1
+        if self.speech_frames(chunk) >= self.min_speech_frames:
+            self.is_open = True
+            self._hangover = self.hangover_samples
+            return True
+        if self._hangover > 0:
+            # Keep the gate open through short pauses so trailing words aren't lost
+            self._hangover -= len(chunk)
+            return True
+        self.is_open = False
+        self.skipped += 1
+        return False
+
+    def stats(self):
+        return {"checked": self.checked, "skipped": self.skipped, "skip_ratio": self.skip_ratio}
@@ -0,0 +1,51 @@
+import customtkinter as ctk
+
+from transcription.jobs import PENDING, RUNNING, DONE, FAILED, CANCELLED
+
+STATUS_LABELS = {
+    PENDING: ("En cola", "#999"),
+    RUNNING: ("Transcribiendo", "#ffaa00"),
+    DONE: ("Guardado", "#00cc66"),
+    FAILED: ("Error", "#e63946"),
+    CANCELLED: ("Cancelado", "#777"),
+}
+
+class JobsPanel(ctk.CTkScrollableFrame):
+    """Compact list of file-transcription jobs with per-job progress, cancel and retry."""
+
+    def __init__(self, parent, job_queue, **kwargs):
+        super().__init__(parent, fg_color="#1e1e2e", corner_radius=10, height=120, **kwargs)
+        self.job_queue = job_queue
+        self.rows = {}  # job id -> widgets
+        self.grid_columnconfigure(0, weight=1)
+
+    def update_job(self, job):
+        """Create or refresh the row of `job` (UI thread only)."""
+        row = self.rows.get(job.id) or self._create_row(job)
+        text, color = STATUS_LABELS[job.status]
+        if job.status == RUNNING:
+            text = f"{text} {job.progress:.0%}"
+        elif job.status == FAILED and job.error:
+            text = f"{text}: {job.error[:40]}"
+        row["status"].configure(text=text, text_color=color)
+        row["progress"].set(job.progress)
+
+        if job.status in (PENDING, RUNNING):
+            row["action"].configure(text="✖", command=lambda: self.job_queue.cancel(job.id))
+        elif job.status in (FAILED, CANCELLED):
+            row["action"].configure(text="↻", command=lambda: self.job_queue.retry(job.id))
+        else:
+            row["action"].configure(text="", command=None)
+
+    def _create_row(self, job):
+        index = len(self.rows)
+        name = ctk.CTkLabel(self, text=f"🎙️ {job.name}", font=ctk.CTkFont(size=12), anchor="w")
+        name.grid(row=index, column=0, sticky="ew", padx=(10, 5), pady=2)
+        progress = ctk.CTkProgressBar(self, width=140, height=8)
+        progress.grid(row=index, column=1, padx=5)
+        status = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=11), width=140, anchor="w")
+        status.grid(row=index, column=2, padx=5)
+        action = ctk.CTkButton(self, text="", width=28, height=24, fg_color="#3a3a4c", hover_color="#4a4a5c")
+        action.grid(row=index, column=3, padx=(5, 10))
+        self.rows[job.id] = {"status": status, "progress": progress, "action": action}
+        return self.rows[job.id]
@@ -0,0 +1,78 @@
+"""
+Disposable key -> JSON value store in its own SQLite file, behind the
+transcript cache and the LLM response cache.
+
+The total stored size is capped at `max_bytes`; the least recently used
+entries are evicted first. Like Database, every call opens and closes its
+own connection, so a store can be shared between threads.
+"""
+import json
+import logging
+import os
+import sqlite3
+import time
+
+
+class LRUStore:
+    def __init__(self, path, max_bytes, label="entry"):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.label = label  # For log messages ("transcript", "LLM response")
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute('''CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value_json TEXT,
+            size_bytes INTEGER,
+            last_used REAL
+        )''')
+        conn.commit()
+        conn.close()
+
+    def get(self, key):
+        """Parsed JSON value for `key`, or None."""
+        conn = sqlite3.connect(self.path)
+        row = conn.execute("SELECT value_json FROM entries WHERE key = ?", (key,)).fetchone()
+        if row:
+            conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        conn.close()
+        if not row:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        data = json.dumps(value, ensure_ascii=False)
+        size_bytes = len(data.encode("utf-8"))
+        if size_bytes > self.max_bytes:
+            return
+        conn = sqlite3.connect(self.path)
+        conn.execute("INSERT OR REPLACE INTO entries (key, value_json, size_bytes, last_used) VALUES (?, ?, ?, ?)",
+                     (key, data, size_bytes, time.time()))
+        self._evict(conn)
+        conn.commit()
+        conn.close()
+
+    def clear(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("DELETE FROM entries")
+        conn.commit()
+        conn.close()
+
+    def _evict(self, conn):
+        """Delete least recently used entries until the total size fits `max_bytes`."""
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size_bytes FROM entries ORDER BY last_used").fetchall()
+        for key, size_bytes in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size_bytes
+            self.logger.info(f"Evicted cached {self.label} {key[:8]} ({size_bytes} bytes)")
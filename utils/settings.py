@@ -0,0 +1,46 @@
+import json
+import logging
+import os
+
+SETTINGS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "settings.json")
+
+DEFAULTS = {
+    "model": "medium",         # Last used Whisper size
+    "preload_model": True,     # Load + warm up the model in the background at startup
+    "live_engine": "whisper",  # "whisper" or "vosk" for live captions
+    "vosk_model": "model",     # Vosk model directory (as in live_transcribe_teams.py)
+    "live_out_of_process": False, # Run the live model in a child process (shared-memory audio, smoother UI)
+    "live_refine": False,      # Dual mode: small model live, larger model refines lines in the background
+    "refine_model": "large-v3",
+    "dual_live_model": "small", # Dual mode: live model ("model" stays the precision choice, used for uploads)
+    "file_workers": 1,         # >1: transcribe uploads in a process pool (CPU only, one model per process)
+    "file_batch_size": 8,      # >1: batched decoding of uploads (reduced or disabled when RAM is low)
+    "file_stream_decode": True, # Decode uploads in fixed windows (flat memory) instead of all at once
+    "file_job_concurrency": 1, # Files of the upload queue transcribed at the same time
+    "transcript_cache_mb": 200, # Size cap of the content-addressed transcript cache (LRU)
+    "analysis_parallel": 0,    # AI analysis steps at once (0: OLLAMA_NUM_PARALLEL, 1 if unset); each needs its own context in VRAM
+    "analysis_mode": "steps",  # "combined": summary, vocabulary, quiz and flashcards from one LLM call
+    "llm_cache_mb": 50,        # Size cap of the LLM response cache (LRU); 0 disables it
+    "llm_cache_bypass": False, # Ignore cached LLM responses (regenerate and overwrite them)
+    "translate": False,        # Translate final lines EN→ES in the background (argostranslate)
+    "translation_cache_size": 2000, # Sentences kept in the translation LRU cache
+}
+
+def load_settings(path=SETTINGS_PATH):
+    """Return saved user settings merged over DEFAULTS (missing/corrupt file -> defaults)."""
+    settings = dict(DEFAULTS)
+    try:
+        with open(path, encoding="utf-8") as f:
+            settings.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Ignoring unreadable settings file: {e}")
+    return settings
+
+def save_settings(settings, path=SETTINGS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+    os.replace(tmp, path)
@@ -0,0 +1,37 @@
+import logging
+import time
+
+
+class StartupTimer:
+    """
+    Wall time of each launch stage, from process start to the first drawn
+    window, plus background stages (translation check, model preload) that
+    run after the window is up and must not delay it.
+    """
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.stages = []
+        self.background = []
+        self._last = self.started
+        self.logger = logging.getLogger(__name__)
+
+    def mark(self, stage):
+        """Foreground stage finished now (its time runs from the previous mark)."""
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def add_background(self, stage, seconds):
+        self.background.append((stage, seconds))
+        self.logger.info(f"Startup (background): {stage} {seconds:.2f}s")
+
+    def total(self):
+        return self._last - self.started
+
+    def report(self):
+        stages = " | ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.stages)
+        return f"Startup: {stages} = {self.total():.2f}s to window"
+
+    def log_report(self):
+        self.logger.info(self.report())